@@ -1,56 +1,90 @@
 #!/usr/bin/env python3
+import numpy as np
 import pandas as pd
+from math import factorial
 
-# 1. Load historical data
-df = pd.read_excel(
-    '/Users/pivda/Gruppenprojekt Data2Dollar/Bundesliga_Prognosen & Ergebnisse/Oddsportal_Historische Daten/Historische Daten.xlsx',
-    sheet_name='oddsportal_bundesliga_results_o'
-)
+# Model strategy: 'rates' (historic W/D/L rates), 'decay' (time-decayed rates) or 'poisson' (goal-rate model)
+STRATEGY = 'rates'
+# Half-life of a match weight for the 'decay' strategy
+HALF_LIFE_DAYS = 365
+# Date column of the Oddsportal export, used for time decay and backtesting
+DATE_COLUMN = 'Date'
+# Goals per team considered when summing the Poisson score matrix
+MAX_GOALS = 10
+# Prior for the Poisson strengths: every team starts with this many (weighted) league-average matches
+PRIOR_WEIGHT = 5
+# Print the season-by-season backtest of STRATEGY instead of only predicting the upcoming fixtures
+BACKTEST = False
+DATA_FILE = '/Users/pivda/Gruppenprojekt Data2Dollar/Bundesliga_Prognosen & Ergebnisse/Oddsportal_Historische Daten/Historische Daten.xlsx'
 
-# 2. Create a result column: 'H' = home win, 'D' = draw, 'A' = away win
-df['result'] = df.apply(
-    lambda x: 'H' if x['Score_Home Team'] > x['Score_Away Team']
-              else ('A' if x['Score_Home Team'] < x['Score_Away Team'] else 'D'),
-    axis=1
-)
+# 1. Load historical data
+def load_results(path=DATA_FILE):
+    df = pd.read_excel(path, sheet_name='oddsportal_bundesliga_results_o')
+    
+    # 2. Create a result column: 'H' = home win, 'D' = draw, 'A' = away win
+    df['result'] = np.select(
+        [df['Score_Home Team'] > df['Score_Away Team'], df['Score_Home Team'] < df['Score_Away Team']],
+        ['H', 'A'],
+        default='D'
+    )
+    return df
 
 # 3. Calculate home and away win/draw/loss rates for each team
-def get_team_stats(df):
-    teams = set(df['Home Team']).union(set(df['Away Team']))
-    stats = {}
-    for team in teams:
-        # Home stats
-        home_games = df[df['Home Team'] == team]
-        home_total = len(home_games)
-        home_win = (home_games['result'] == 'H').sum()
-        home_draw = (home_games['result'] == 'D').sum()
-        home_loss = (home_games['result'] == 'A').sum()
-        # Avoid division by zero
-        if home_total > 0:
-            home_win_rate = home_win / home_total
-            home_draw_rate = home_draw / home_total
-            home_loss_rate = home_loss / home_total
-        else:
-            home_win_rate = home_draw_rate = home_loss_rate = 0
-        # Away stats
-        away_games = df[df['Away Team'] == team]
-        away_total = len(away_games)
-        away_win = (away_games['result'] == 'A').sum()
-        away_draw = (away_games['result'] == 'D').sum()
-        away_loss = (away_games['result'] == 'H').sum()
-        if away_total > 0:
-            away_win_rate = away_win / away_total
-            away_draw_rate = away_draw / away_total
-            away_loss_rate = away_loss / away_total
-        else:
-            away_win_rate = away_draw_rate = away_loss_rate = 0
-        stats[team] = {
-            'home': {'W': home_win_rate, 'D': home_draw_rate, 'L': home_loss_rate},
-            'away': {'W': away_win_rate, 'D': away_draw_rate, 'L': away_loss_rate}
-        }
-    return stats
+def match_weights(df, strategy=STRATEGY, half_life_days=HALF_LIFE_DAYS, reference_date=None):
+    """Weight per match: 1 for the plain strategies, exponential decay by age for 'decay'"""
+    if strategy != 'decay':
+        return pd.Series(1.0, index=df.index)
+    dates = pd.to_datetime(df[DATE_COLUMN], dayfirst=True, errors='coerce')
+    reference_date = dates.max() if reference_date is None else reference_date
+    age_days = (reference_date - dates).dt.days.fillna(0).clip(lower=0)
+    return np.power(0.5, age_days / half_life_days)
+
+def get_team_stats(df, weights=None):
+    """Home and away W/D/L rates of every team (columns ('home'|'away', 'W'|'D'|'L')) in one groupby"""
+    if weights is None:
+        weights = pd.Series(1.0, index=df.index)
+    # Every match seen once from the home team's and once from the away team's perspective
+    long = pd.concat([
+        pd.DataFrame({'team': df['Home Team'], 'venue': 'home',
+                      'outcome': df['result'].map({'H': 'W', 'D': 'D', 'A': 'L'}), 'weight': weights}),
+        pd.DataFrame({'team': df['Away Team'], 'venue': 'away',
+                      'outcome': df['result'].map({'A': 'W', 'D': 'D', 'H': 'L'}), 'weight': weights}),
+    ], ignore_index=True)
+    counts = long.pivot_table(index='team', columns=['venue', 'outcome'], values='weight', aggfunc='sum', fill_value=0)
+    counts = counts.reindex(columns=pd.MultiIndex.from_product([['home', 'away'], ['W', 'D', 'L']]), fill_value=0)
+    # Avoid division by zero: teams without home (or away) games keep rates of 0
+    totals = counts.T.groupby(level=0).transform('sum').T
+    return (counts / totals.where(totals > 0)).fillna(0)
+
+def get_goal_rates(df, weights=None, prior_weight=PRIOR_WEIGHT):
+    """Attack/defence strengths relative to the league average for the Poisson model
 
-team_stats = get_team_stats(df)
+    Each strength is shrunk toward 1.0 by prior_weight league-average matches, so teams with
+    little history (e.g. promoted clubs) do not get a strength of 0 and a certain outcome.
+    """
+    if weights is None:
+        weights = pd.Series(1.0, index=df.index)
+    home_goals = df['Score_Home Team'] * weights
+    away_goals = df['Score_Away Team'] * weights
+    league_home = home_goals.sum() / weights.sum()
+    league_away = away_goals.sum() / weights.sum()
+    home = pd.DataFrame({'scored': home_goals, 'conceded': away_goals, 'weight': weights}).groupby(df['Home Team']).sum()
+    away = pd.DataFrame({'scored': away_goals, 'conceded': home_goals, 'weight': weights}).groupby(df['Away Team']).sum()
+    def strength(goals, weight, league_rate):
+        return (goals + prior_weight * league_rate) / (weight + prior_weight) / league_rate
+    rates = pd.DataFrame({
+        'home_attack': strength(home['scored'], home['weight'], league_home),
+        'home_defence': strength(home['conceded'], home['weight'], league_away),
+        'away_attack': strength(away['scored'], away['weight'], league_away),
+        'away_defence': strength(away['conceded'], away['weight'], league_home),
+    }).fillna(1.0)
+    return rates, league_home, league_away
+
+def fit_model(df, strategy=STRATEGY, reference_date=None):
+    weights = match_weights(df, strategy, reference_date=reference_date)
+    if strategy == 'poisson':
+        return {'strategy': strategy, 'goal_rates': get_goal_rates(df, weights)}
+    return {'strategy': strategy, 'team_stats': get_team_stats(df, weights)}
 
 # 4. Prepare upcoming fixtures
 upcoming = pd.DataFrame({
@@ -78,41 +112,89 @@ upcoming = pd.DataFrame({
     ]
 })
 
-# 5. Predict probabilities for each match
-def predict_probabilities(home_team, away_team, stats):
-    # Home team at home, away team away
-    home = stats.get(home_team, {'home': {'W':0, 'D':0, 'L':0}})['home']
-    away = stats.get(away_team, {'away': {'W':0, 'D':0, 'L':0}})['away']
-    # Average the probabilities
-    prob_home_win = (home['W'] + away['L']) / 2
-    prob_draw = (home['D'] + away['D']) / 2
-    prob_away_win = (home['L'] + away['W']) / 2
+# 5. Predict probabilities for all fixtures at once
+def predict_rates(home_teams, away_teams, stats):
+    # Home team at home, away team away; unknown teams get rates of 0
+    home = stats['home'].reindex(home_teams, fill_value=0).to_numpy()
+    away = stats['away'].reindex(away_teams, fill_value=0).to_numpy()
+    # Average the probabilities (columns W, D, L)
+    probs = np.column_stack([
+        (home[:, 0] + away[:, 2]) / 2,
+        (home[:, 1] + away[:, 1]) / 2,
+        (home[:, 2] + away[:, 0]) / 2,
+    ])
     # Normalize to sum to 1
-    total = prob_home_win + prob_draw + prob_away_win
-    if total > 0:
-        prob_home_win /= total
-        prob_draw /= total
-        prob_away_win /= total
-    return prob_home_win, prob_draw, prob_away_win
+    total = probs.sum(axis=1, keepdims=True)
+    return np.divide(probs, total, out=probs.copy(), where=total > 0)
+
+def predict_poisson(home_teams, away_teams, goal_rates, max_goals=MAX_GOALS):
+    rates, league_home, league_away = goal_rates
+    # Unknown teams are treated as league average (strength 1)
+    home = rates.reindex(home_teams, fill_value=1.0)
+    away = rates.reindex(away_teams, fill_value=1.0)
+    lambda_home = league_home * home['home_attack'].to_numpy() * away['away_defence'].to_numpy()
+    lambda_away = league_away * away['away_attack'].to_numpy() * home['home_defence'].to_numpy()
+    goals = np.arange(max_goals + 1)
+    factorials = np.array([factorial(k) for k in goals], dtype=float)
+    pmf_home = np.exp(-lambda_home)[:, None] * lambda_home[:, None] ** goals / factorials
+    pmf_away = np.exp(-lambda_away)[:, None] * lambda_away[:, None] ** goals / factorials
+    # Score matrix per fixture: [fixture, home goals, away goals]
+    scores = pmf_home[:, :, None] * pmf_away[:, None, :]
+    probs = np.column_stack([
+        np.tril(scores, k=-1).sum(axis=(1, 2)),
+        np.trace(scores, axis1=1, axis2=2),
+        np.triu(scores, k=1).sum(axis=(1, 2)),
+    ])
+    return probs / probs.sum(axis=1, keepdims=True)
+
+def predict_fixtures(fixtures, model):
+    """Home/draw/away probabilities for a whole fixture table in one array operation"""
+    home_teams, away_teams = fixtures['Home Team'], fixtures['Away Team']
+    if model['strategy'] == 'poisson':
+        probs = predict_poisson(home_teams, away_teams, model['goal_rates'])
+    else:
+        probs = predict_rates(home_teams, away_teams, model['team_stats'])
+    return fixtures[['Home Team', 'Away Team']].assign(**{
+        'Home Win Probability': probs[:, 0],
+        'Draw Probability': probs[:, 1],
+        'Away Win Probability': probs[:, 2],
+    }).reset_index(drop=True)
 
-print("\n=== Upcoming Matches: Historic Win/Draw/Loss Probabilities ===")
-results = []
-for idx, row in upcoming.iterrows():
-    home, away = row['Home Team'], row['Away Team']
-    pH, pD, pA = predict_probabilities(home, away, team_stats)
-    print(f"\n{home} vs {away}:")
-    print(f"  Home win:  {pH:.2%}")
-    print(f"  Draw:      {pD:.2%}")
-    print(f"  Away win:  {pA:.2%}")
-    results.append({
-        'Home Team': home,
-        'Away Team': away,
-        'Home Win Probability': pH,
-        'Draw Probability': pD,
-        'Away Win Probability': pA
-    })
+def backtest(df, strategy=STRATEGY):
+    """Predict every season from all earlier seasons; returns accuracy and log loss per season"""
+    dates = pd.to_datetime(df[DATE_COLUMN], dayfirst=True, errors='coerce')
+    # Bundesliga seasons start in July/August
+    season = dates.dt.year - (dates.dt.month < 7)
+    rows = []
+    for start in sorted(season.dropna().unique())[1:]:
+        history, test = df[season < start], df[season == start]
+        model = fit_model(history, strategy, reference_date=dates[season == start].min())
+        probs = predict_fixtures(test, model)[['Home Win Probability', 'Draw Probability', 'Away Win Probability']].to_numpy()
+        actual = pd.Categorical(test['result'], categories=['H', 'D', 'A']).codes
+        picked = probs[np.arange(len(test)), actual]
+        rows.append({
+            'Season': f"{int(start)}/{int(start) + 1}",
+            'Matches': len(test),
+            'Accuracy': (probs.argmax(axis=1) == actual).mean(),
+            'Log Loss': -np.log(np.clip(picked, 1e-15, 1)).mean(),
+        })
+    return pd.DataFrame(rows)
 
-# Export to Excel
-df_results = pd.DataFrame(results)
-df_results.to_excel('upcoming_predictions.xlsx', index=False)
-print("\nPredictions exported to upcoming_predictions.xlsx")
\ No newline at end of file
+if __name__ == "__main__":
+    df = load_results()
+    
+    if BACKTEST:
+        print(f"\n=== Backtest: every season predicted from all earlier seasons ({STRATEGY}) ===")
+        print(backtest(df, STRATEGY).to_string(index=False))
+    
+    print(f"\n=== Upcoming Matches: Historic Win/Draw/Loss Probabilities ({STRATEGY}) ===")
+    df_results = predict_fixtures(upcoming, fit_model(df, STRATEGY))
+    for row in df_results.itertuples(index=False):
+        print(f"\n{row[0]} vs {row[1]}:")
+        print(f"  Home win:  {row[2]:.2%}")
+        print(f"  Draw:      {row[3]:.2%}")
+        print(f"  Away win:  {row[4]:.2%}")
+    
+    # Export to Excel
+    df_results.to_excel('upcoming_predictions.xlsx', index=False)
+    print("\nPredictions exported to upcoming_predictions.xlsx")
\ No newline at end of file
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import re
 
@@ -42,62 +43,73 @@ pattern = re.compile(
     flags=re.IGNORECASE
 )
 
-def extract_predictions(comment):
-    predictions = []
-    for match in pattern.finditer(comment):
-        team1, team2, score1, score2 = match.groups()
-        predictions.append({
-            'team1': team1.strip(),
-            'team2': team2.strip(),
-            'prediction': f"{score1}:{score2}"
-        })
-    return predictions
+# Alias-Index: pro Verein ein vorkompiliertes Muster aus Vereinsname und allen Aliasen (Teilstring, ohne Groß-/Kleinschreibung)
+teams = list(team_aliases)
+alias_patterns = {
+    team: re.compile('|'.join(re.escape(alias.lower()) for alias in [team] + aliases))
+    for team, aliases in team_aliases.items()
+}
+
+def extract_predictions(comments):
+    """Alle Ergebnisvorhersagen aller Kommentare in einem Durchlauf (eine Zeile pro Vorhersage)"""
+    predictions = comments.str.extractall(pattern.pattern, flags=re.IGNORECASE)
+    predictions.columns = ['team1', 'team2', 'score1', 'score2']
+    predictions['team1'] = predictions['team1'].str.strip()
+    predictions['team2'] = predictions['team2'].str.strip()
+    predictions['prediction'] = predictions['score1'] + ':' + predictions['score2']
+    return predictions.droplevel('match')
+
+def resolve_teams(names):
+    """Boolean-Matrix (Namen x Vereine): True, wenn der Name einen Alias des Vereins enthält"""
+    lowered = names.str.lower()
+    # Jeder unterschiedliche Teamname wird nur einmal gegen den Alias-Index geprüft
+    unique = pd.Series(lowered.unique(), dtype=object)
+    hits = pd.DataFrame(
+        {team: unique.str.contains(alias_pattern, regex=True) for team, alias_pattern in alias_patterns.items()}
+    )
+    hits.index = unique
+    return hits.reindex(lowered).to_numpy(dtype=bool)
 
-def is_relevant_comment(comment):
-    if not comment or len(comment) < 10:
-        return False
-    if any(word in comment.lower() for word in ["http", "www", "instagram", "telegram", "youtube"]):
-        return False
-    return True
+def is_relevant_comment(comments):
+    too_short = comments.str.len() < 10
+    has_link = comments.str.lower().str.contains('http|www|instagram|telegram|youtube', regex=True)
+    return ~(too_short | has_link)
 
 # Daten laden und bereinigen
 df = pd.read_csv('YT_Comments_Roh.csv')
 df['comment'] = df['comment'].astype(str)
-df = df[df['comment'].apply(is_relevant_comment)]
+df = df[is_relevant_comment(df['comment'])]
+
+# Jeder Kommentar wird genau einmal geparst
+predictions = extract_predictions(df['comment']).join(df[['comment', 'num_of_likes']])
+
+# Vorhersagen den Spielen zuordnen: Heimteam in team1 und Auswärtsteam in team2 (Matrix Vorhersagen x Spiele)
+home_idx = [teams.index(match["home"]) for match in matches]
+away_idx = [teams.index(match["away"]) for match in matches]
+team1_hits = resolve_teams(predictions['team1'])
+team2_hits = resolve_teams(predictions['team2'])
+pred_pos, match_pos = np.nonzero(team1_hits[:, home_idx] & team2_hits[:, away_idx])
+
+assigned = pd.DataFrame({
+    'match': [matches[i]["short"] for i in match_pos],
+    'comment': predictions['comment'].to_numpy()[pred_pos],
+    'prediction': predictions['prediction'].to_numpy()[pred_pos],
+    'likes': predictions['num_of_likes'].to_numpy()[pred_pos],
+})
+
+# Kombinierte Tabelle aller Spiele (Eingabe für die Auswertung) und eine separate CSV pro Spiel
+assigned.to_csv("predictions_all.csv", index=False)
+by_match = {short: group for short, group in assigned.groupby('match', sort=False)}
 
-# Für jedes Spiel eine separate CSV erstellen
 for match in matches:
     home = match["home"]
     away = match["away"]
     short = match["short"]
     
-    # Alle Aliases für die Teams
-    home_aliases = [home] + team_aliases.get(home, [])
-    away_aliases = [away] + team_aliases.get(away, [])
-    
-    # DataFrame für dieses Spiel
-    match_data = []
-    
-    for _, row in df.iterrows():
-        comment = row['comment']
-        predictions = extract_predictions(comment)
-        
-        for pred in predictions:
-            # Prüfe ob die Vorhersage zu diesem Spiel gehört
-            team1_match = any(alias.lower() in pred['team1'].lower() for alias in home_aliases)
-            team2_match = any(alias.lower() in pred['team2'].lower() for alias in away_aliases)
-            
-            if team1_match and team2_match:
-                match_data.append({
-                    'comment': comment,
-                    'prediction': pred['prediction'],
-                    'likes': row['num_of_likes']
-                })
-    
-    if match_data:
-        match_df = pd.DataFrame(match_data)
+    match_df = by_match.get(short)
+    if match_df is not None:
         filename = f"predictions_{short.replace(' ', '_')}.csv"
-        match_df.to_csv(filename, index=False)
+        match_df.drop(columns='match').to_csv(filename, index=False)
         print(f"✅ {len(match_df)} Vorhersagen für {home} vs {away} gespeichert als {filename}")
     else:
         print(f"⚠️ Keine Vorhersagen gefunden für {home} vs {away}")
@@ -9,6 +9,10 @@
 # https://www.youtube.com/watch?v=mfnRMrPcwNU - VIDEO_ID = "mfnRMrPcwNU"
 # 
 
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 import pandas as pd
@@ -28,62 +32,174 @@ VIDEO_IDS = [
     "mfnRMrPcwNU"
 ]
 
-def get_comments(video_id, part="snippet", max_results=100):
+# Number of videos harvested at the same time
+MAX_WORKERS = 4
+# API quota units this run may spend (commentThreads.list and comments.list cost 1 unit per page)
+QUOTA_BUDGET = 10000
+# One dataset for all videos, partitioned as <DATASET_DIR>/video_id=<id>/part-0.parquet
+DATASET_DIR = "YT_Comments_Roh.parquet"
+# Additionally write all comments as one flat CSV (input of Cleaning_YT_Comments.py)
+EXPORT_CSV = "YT_Comments_Roh.csv"
+
+COLUMNS = ["video_id", "comment_id", "parent_id", "comment", "num_of_likes", "author", "published_at"]
+
+
+class QuotaBudget:
+    """Thread-safe counter of the API quota units spent in this run"""
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = 0
+        self.lock = threading.Lock()
+
+    def spend(self, cost=1):
+        """Reserve quota for one request; returns False once the budget is exhausted"""
+        with self.lock:
+            if self.used + cost > self.limit:
+                return False
+            self.used += cost
+            return True
+
+
+# googleapiclient clients are not thread-safe, so every worker thread builds its client once and reuses it
+_local = threading.local()
+
+def get_client():
+    if not hasattr(_local, "youtube"):
+        _local.youtube = build("youtube", "v3", developerKey=DEVELOPER_KEY)
+    return _local.youtube
+
+
+def comment_row(video_id, comment, parent_id=None):
+    snippet = comment["snippet"]
+    return {
+        "video_id": video_id,
+        "comment_id": comment["id"],
+        "parent_id": parent_id,
+        "comment": snippet["textDisplay"],
+        "num_of_likes": snippet["likeCount"],
+        "author": snippet.get("authorDisplayName"),
+        "published_at": snippet.get("publishedAt"),
+    }
+
+
+def get_replies(youtube, video_id, parent_id, quota):
+    """Page through all replies of one comment thread; returns (replies, True if all pages were read)"""
+    replies = []
+    page_token = None
+    while True:
+        if not quota.spend():
+            return replies, False
+        response = youtube.comments().list(
+            part="snippet",
+            parentId=parent_id,
+            textFormat="plainText",
+            maxResults=100,
+            pageToken=page_token
+        ).execute()
+        replies.extend(comment_row(video_id, item, parent_id) for item in response["items"])
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return replies, True
+
+
+def get_comments(video_id, quota, part="snippet,replies", max_results=100):
     """
-    Function to get comments from a YouTube video
+    Function to get all comments (threads and replies) from a YouTube video
 
     Args:
         video_id: The ID of the YouTube video
-        part: The part of the comment snippet to retrieve. Defaults to "snippet".
-        max_results: The maximum number of comments to retrieve. Defaults to 100.
+        quota: QuotaBudget shared by all videos of this run
+        part: The parts of the comment threads to retrieve. Defaults to "snippet,replies".
+        max_results: Comment threads per page (API maximum is 100).
 
     Returns:
-        A list of dictionaries containing comment text and number of likes.
+        A tuple (list of comment dictionaries, True if the video was read completely).
     """
-    youtube = build("youtube", "v3", developerKey=DEVELOPER_KEY)
+    youtube = get_client()
+    comments = []
+    page_token = None
+    # Only this video's own skipped pages count, other workers may use up the budget independently
+    complete = True
 
     try:
-        # Retrieve comment thread using the youtube.commentThreads().list() method
-        response = youtube.commentThreads().list(
-            part=part,
-            videoId=video_id,
-            textFormat="plainText",
-            maxResults=max_results
-        ).execute()
+        while True:
+            if not quota.spend():
+                print(f"Quota budget exhausted, comments of video ID {video_id} are incomplete.")
+                return comments, False
+
+            # Retrieve one page of comment threads using the youtube.commentThreads().list() method
+            response = youtube.commentThreads().list(
+                part=part,
+                videoId=video_id,
+                textFormat="plainText",
+                maxResults=max_results,
+                pageToken=page_token
+            ).execute()
 
-        comments = []
-        for item in response["items"]:
-            comment_text = item["snippet"]["topLevelComment"]["snippet"]["textDisplay"]
-            likes = item["snippet"]["topLevelComment"]["snippet"]["likeCount"]
-            comments.append({"comment": comment_text, "num_of_likes": likes})
+            for item in response["items"]:
+                top_level = item["snippet"]["topLevelComment"]
+                comments.append(comment_row(video_id, top_level))
 
-        return comments
+                # The thread only carries a few replies; fetch the rest if there are more
+                inline_replies = item.get("replies", {}).get("comments", [])
+                if item["snippet"].get("totalReplyCount", 0) > len(inline_replies):
+                    replies, replies_complete = get_replies(youtube, video_id, top_level["id"], quota)
+                    comments.extend(replies)
+                    complete = complete and replies_complete
+                else:
+                    comments.extend(comment_row(video_id, reply, top_level["id"]) for reply in inline_replies)
+
+            page_token = response.get("nextPageToken")
+            if not page_token:
+                if not complete:
+                    print(f"Quota budget exhausted, replies of video ID {video_id} are incomplete.")
+                return comments, complete
     except HttpError as error:
         print(f"An HTTP error {error.http_status} occurred:\n {error.content}")
-        return None
+        return comments, False
+
+
+def write_partition(video_id, df):
+    """Write the comments of one video as its partition of the dataset (replacing an older run)"""
+    partition_dir = os.path.join(DATASET_DIR, f"video_id={video_id}")
+    os.makedirs(partition_dir, exist_ok=True)
+    df.drop(columns="video_id").to_parquet(os.path.join(partition_dir, "part-0.parquet"), index=False)
+
 
 def main():
-    for video_id in VIDEO_IDS:
-        # Get comments from the video
-        comments = get_comments(video_id)
-
-        if comments:
-            # Create a pandas dataframe from the comments list
-            df = pd.DataFrame(comments)
-
-            # Sort dataframe by number of likes in descending order
-            df = df.sort_values(by=['num_of_likes'], ascending=False)
-
-            # Print a preview of the first 10 rows
-            print(f"Comments for video ID {video_id}:")
-            print(df.head(10))
-
-            # Export dataframe to a CSV file named "<video_id>_comments.csv"
-            csv_filename = f"{video_id}_comments.csv"
-            df.to_csv(csv_filename, index=False)
-            print(f"Comments for video ID {video_id} saved to {csv_filename}")
-        else:
-            print(f"Error: Could not retrieve comments from video ID {video_id}.")
+    quota = QuotaBudget(QUOTA_BUDGET)
+    frames = []
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        futures = {executor.submit(get_comments, video_id, quota): video_id for video_id in VIDEO_IDS}
+        for future in as_completed(futures):
+            video_id = futures[future]
+            comments, complete = future.result()
+
+            if comments:
+                # Create a pandas dataframe from the comments list
+                df = pd.DataFrame(comments, columns=COLUMNS)
+
+                # Sort dataframe by number of likes in descending order
+                df = df.sort_values(by=['num_of_likes'], ascending=False)
+
+                # Print a preview of the first 10 rows
+                print(f"Comments for video ID {video_id}:")
+                print(df[["comment", "num_of_likes"]].head(10))
+
+                write_partition(video_id, df)
+                frames.append(df)
+                status = "" if complete else " (incomplete)"
+                print(f"{len(df)} comments for video ID {video_id} saved to {DATASET_DIR}{status}")
+            else:
+                print(f"Error: Could not retrieve comments from video ID {video_id}.")
+
+    print(f"Used {quota.used} of {quota.limit} quota units.")
+
+    if frames and EXPORT_CSV:
+        pd.concat(frames, ignore_index=True).to_csv(EXPORT_CSV, index=False)
+        print(f"All comments saved to {EXPORT_CSV}")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,93 @@
+import glob
+import os
+
+import pandas as pd
+
+# Kombinierte Tabelle aller Spiele aus Cleaning_YT_Comments.py
+COMBINED_FILE = 'predictions_all.csv'
+
+
+def match_label(short):
+    """'WOB-SCF' -> 'WOB vs SCF'"""
+    return short.replace('-', ' vs ')
+
+
+def load_predictions(file_pattern='predictions_*.csv', combined_file=COMBINED_FILE):
+    """Alle Vorhersagen als eine Tabelle (match, prediction, likes).
+
+    Bevorzugt die kombinierte Tabelle; sonst werden die einzelnen predictions_<Spiel>.csv
+    Dateien gelesen und der Spielname aus dem Dateinamen übernommen.
+    """
+    if combined_file and os.path.exists(combined_file):
+        df = pd.read_csv(combined_file)
+    else:
+        frames = []
+        for file in glob.glob(file_pattern):
+            if os.path.basename(file) == os.path.basename(combined_file or ''):
+                continue
+            try:
+                frame = pd.read_csv(file)
+            except Exception as e:
+                print(f"Fehler bei der Verarbeitung von {file}: {str(e)}")
+                continue
+            frames.append(frame.assign(match=file.split('_')[-1].split('.')[0]))
+        if not frames:
+            return pd.DataFrame(columns=['match', 'prediction', 'likes'])
+        df = pd.concat(frames, ignore_index=True)
+
+    df = df[['match', 'prediction', 'likes']].copy()
+    df['match'] = df['match'].map(match_label)
+    df['prediction'] = df['prediction'].astype(str).str.strip()
+    return df
+
+
+def weighted_distribution(df):
+    """Gewichtete Verteilung der Vorhersagen pro Spiel (jede Vorhersage zählt Likes + 1).
+
+    Eine Zeile pro (match, prediction) mit weight, share (in %) und rank, innerhalb eines
+    Spiels absteigend nach Gewicht sortiert; bei Gleichstand zählt die erste Nennung.
+    """
+    weights = (
+        df.assign(weight=df['likes'] + 1)
+        .groupby(['match', 'prediction'], sort=False)['weight'].sum()
+        .reset_index()
+    )
+    weights['share'] = weights['weight'] / weights.groupby('match', sort=False)['weight'].transform('sum') * 100
+    weights = weights.sort_values('weight', ascending=False, kind='stable')
+    weights['rank'] = weights.groupby('match', sort=False).cumcount() + 1
+
+    # Spiele in der Reihenfolge ihres ersten Auftretens
+    match_order = {match: i for i, match in enumerate(df['match'].unique())}
+    return weights.sort_values(['match', 'rank'], key=lambda col: col.map(match_order) if col.name == 'match' else col,
+                               kind='stable').reset_index(drop=True)
+
+
+def outcome_probabilities(distribution):
+    """Aus den Ergebnisvorhersagen abgeleitete Wahrscheinlichkeiten für Heimsieg/Remis/Auswärtssieg"""
+    goals = distribution['prediction'].str.split(':', n=1, expand=True).apply(pd.to_numeric, errors='coerce')
+    outcome = pd.Series('D', index=distribution.index)
+    outcome[goals[0] > goals[1]] = 'H'
+    outcome[goals[0] < goals[1]] = 'A'
+    probabilities = distribution.assign(outcome=outcome).pivot_table(
+        index='match', columns='outcome', values='share', aggfunc='sum', fill_value=0, sort=False
+    )
+    return probabilities.reindex(columns=['H', 'D', 'A'], fill_value=0).div(100)
+
+
+def summarize_predictions(df, top_k=6):
+    """Zusammenfassung pro Spiel: Top-k Vorhersagen mit Anteil, Gesamtgewicht und H/D/A-Wahrscheinlichkeiten"""
+    distribution = weighted_distribution(df)
+    top = distribution[distribution['rank'] <= top_k]
+    top_labels = top['prediction'] + ' (' + top['share'].map('{:.1f}%'.format) + ')'
+
+    grouped = distribution.groupby('match', sort=False)
+    summary = pd.DataFrame({
+        'Top Predictions': top_labels.groupby(top['match'], sort=False).agg(' | '.join),
+        'Total Votes': grouped['weight'].sum(),
+        'Most Liked Prediction': grouped['prediction'].first(),
+        'Most Liked Score': grouped['weight'].first(),
+    })
+    probabilities = outcome_probabilities(distribution).round(3)
+    summary[['P(Home)', 'P(Draw)', 'P(Away)']] = probabilities.reindex(summary.index).to_numpy()
+    summary.index.name = 'Match'
+    return summary
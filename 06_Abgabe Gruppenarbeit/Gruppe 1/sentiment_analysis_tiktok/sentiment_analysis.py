@@ -1,18 +1,27 @@
-import glob, json, pathlib, logging
-from functools import lru_cache
+import glob, json, pathlib, logging, argparse, re, os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import numpy as np
 import pandas as pd
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
-from googletrans import Translator
 
 # Set up logging
 logging.basicConfig(level=logging.INFO,
                    format='%(asctime)s - %(levelname)s - %(message)s')
 
-analyser = SentimentIntensityAnalyzer()
-translator = Translator()
+GERMAN_MODEL_NAME = "oliverguhr/german-sentiment-bert"
+SCORE_COLUMNS = ["compound", "pos", "neu", "neg"]
+ALL_SENTIMENTS = ["very positive", "positive", "neutral", "negative", "very negative"]
+DETAILS_FILE = "all_comment_sentiments.csv"
+SUMMARY_FILE = "club_sentiment_summary.csv"
 
-# Translation cache
-translation_cache = {}
+def parse_args():
+    parser = argparse.ArgumentParser(description='Sentiment analysis of TikTok comments per club')
+    parser.add_argument('--backend', default='german_bert', choices=['german_bert', 'translate_vader'],
+                        help='german_bert: offline German transformer (batched); '
+                             'translate_vader: googletrans + VADER (needs network, for comparison)')
+    parser.add_argument('--batch-size', type=int, default=64, help='Batch size for the transformer backend')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of processes; each club file is parsed and scored in its own worker')
+    return parser.parse_args()
 
 # Define sentiment dictionaries at module level
 emoji_replacements = {
@@ -83,55 +92,137 @@ football_boosters = {
     'schwach': 'weak poor disappointing'
 }
 
+class PreprocessingEngine:
+    """Applies emoji_replacements and football_boosters in a single regex scan per comment
+    
+    All emojis are compiled into one alternation (longest first) and replaced in
+    one pass. Booster terms are found with one zero-width lookahead pattern that
+    visits every position of the text once; terms that are prefixes of a longer
+    matching term are added through a precomputed prefix index, so every booster
+    contained in the text is reported, just like a substring test per term.
+    """
+    def __init__(self, emoji_map, booster_map):
+        self.emoji_map = dict(emoji_map)
+        self.emoji_pattern = re.compile(
+            "|".join(re.escape(e) for e in sorted(self.emoji_map, key=len, reverse=True))
+        )
+        self.boosters = [(term.lower(), boost) for term, boost in booster_map.items()]
+        terms = sorted({term for term, _ in self.boosters}, key=len, reverse=True)
+        self.booster_pattern = re.compile("(?=(" + "|".join(map(re.escape, terms)) + "))")
+        self.prefix_index = {
+            term: frozenset(other for other in terms if term.startswith(other)) for term in terms
+        }
+        self._suffix_cache = {}
+
+    def _replace_emoji(self, match):
+        return self.emoji_map[match.group(0)]
+
+    def _booster_suffix(self, matches):
+        key = frozenset(matches)
+        if key not in self._suffix_cache:
+            found = set()
+            for term in key:
+                found |= self.prefix_index[term]
+            boosts = [boost for term, boost in self.boosters if term in found]
+            self._suffix_cache[key] = ". " + " ".join(boosts) if boosts else ""
+        return self._suffix_cache[key]
+
+    def replace_emojis(self, text):
+        return self.emoji_pattern.sub(self._replace_emoji, text)
+
+    def preprocess(self, text):
+        """Emoji replacement plus booster annotation for a single comment"""
+        replaced = self.replace_emojis(text)
+        return replaced + self._booster_suffix(self.booster_pattern.findall(replaced.lower()))
+
+    def preprocess_series(self, texts):
+        """Vectorized preprocess over a pandas string column"""
+        replaced = texts.str.replace(self.emoji_pattern, self._replace_emoji, regex=True)
+        matches = replaced.str.lower().str.findall(self.booster_pattern)
+        return replaced + matches.map(self._booster_suffix)
+
+preprocessor = PreprocessingEngine(emoji_replacements, football_boosters)
+
 def preprocess_text(text):
     """Preprocess text with emoji replacements and return processed text"""
-    for emoji, replacement in emoji_replacements.items():
-        text = text.replace(emoji, replacement)
-    return text
+    return preprocessor.replace_emojis(text)
 
 def preprocess_with_boosters(text):
-    # First apply emoji replacements
-    processed_text = preprocess_text(text)
-    
-    # Apply football-specific boosters
-    lower_text = processed_text.lower()
-    boosts = []
-    
-    # Check for multiple boosters and combine their effects
-    for term, boost in football_boosters.items():
-        if term.lower() in lower_text:
-            boosts.append(boost)
-    
-    if boosts:
-        processed_text = processed_text + ". " + " ".join(boosts)
-    
-    return processed_text
-
-@lru_cache(maxsize=1000)
-def translate_text(text):
-    """Cache translations to avoid redundant API calls"""
-    if text in translation_cache:
-        return translation_cache[text]
-    try:
-        translation = translator.translate(text, dest='en')
-        translation_cache[text] = translation.text
-        return translation.text
-    except Exception as e:
-        logging.warning(f"Translation failed: {e}")
-        return text
-
-def analyze_text(text):
-    try:
-        processed_text = preprocess_with_boosters(text)
-        translated_text = translate_text(processed_text)
-        scores = analyser.polarity_scores(translated_text)
-        
-        if abs(scores['compound']) > 0.75:
-            logging.info(f"Strong sentiment detected ({scores['compound']}): {text}")
-        return scores
-    except Exception as e:
-        logging.error(f"Error in analyze_text: {str(e)}")
-        return {"compound": 0.0, "pos": 0.0, "neu": 1.0, "neg": 0.0}
+    return preprocessor.preprocess(text)
+
+class TranslateVaderScorer:
+    """Original backend: translate every comment to English with googletrans, then score with VADER"""
+    def __init__(self):
+        from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+        from googletrans import Translator
+        self.analyser = SentimentIntensityAnalyzer()
+        self.translator = Translator()
+        self.translation_cache = {}
+
+    def translate_text(self, text):
+        """Cache translations to avoid redundant API calls"""
+        if text in self.translation_cache:
+            return self.translation_cache[text]
+        try:
+            translation = self.translator.translate(text, dest='en')
+            self.translation_cache[text] = translation.text
+            return translation.text
+        except Exception as e:
+            logging.warning(f"Translation failed: {e}")
+            return text
+
+    def score_batch(self, texts):
+        rows = []
+        for text in texts:
+            try:
+                rows.append(self.analyser.polarity_scores(self.translate_text(text)))
+            except Exception as e:
+                logging.error(f"Error in score_batch: {str(e)}")
+                rows.append({"compound": 0.0, "pos": 0.0, "neu": 1.0, "neg": 0.0})
+        return pd.DataFrame(rows, columns=SCORE_COLUMNS)
+
+class GermanBertScorer:
+    """Offline German-native backend: local transformer scored in padded batches, no translation"""
+    def __init__(self, model_name=GERMAN_MODEL_NAME, batch_size=64, max_length=256, num_threads=None):
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSequenceClassification
+        self.torch = torch
+        if num_threads:
+            torch.set_num_threads(num_threads)
+        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModelForSequenceClassification.from_pretrained(model_name).to(self.device).eval()
+        self.batch_size = batch_size
+        self.max_length = max_length
+        label_to_index = {label.lower(): int(i) for i, label in self.model.config.id2label.items()}
+        self.label_indices = [label_to_index[label] for label in ("positive", "neutral", "negative")]
+
+    def score_batch(self, texts):
+        texts = list(texts)
+        probs = np.zeros((len(texts), 3), dtype=np.float32)
+        # Sort by length so every batch is padded only to its longest comment
+        order = np.argsort([len(text) for text in texts], kind="stable")
+        with self.torch.inference_mode():
+            for start in range(0, len(order), self.batch_size):
+                batch_idx = order[start:start + self.batch_size]
+                encoded = self.tokenizer(
+                    [texts[i] for i in batch_idx], padding=True, truncation=True,
+                    max_length=self.max_length, return_tensors="pt"
+                ).to(self.device)
+                logits = self.model(**encoded).logits
+                probs[batch_idx] = self.torch.softmax(logits.float(), dim=-1)[:, self.label_indices].cpu().numpy()
+        # compound in [-1, 1] like VADER, so the category thresholds stay comparable
+        return pd.DataFrame({
+            "compound": probs[:, 0] - probs[:, 2],
+            "pos": probs[:, 0],
+            "neu": probs[:, 1],
+            "neg": probs[:, 2],
+        })
+
+def get_scorer(backend, batch_size=64, num_threads=None):
+    if backend == "translate_vader":
+        return TranslateVaderScorer()
+    return GermanBertScorer(batch_size=batch_size, num_threads=num_threads)
 
 def get_sentiment_category(compound_score):
     if compound_score >= 0.35:  # Lowered threshold for very positive
@@ -145,109 +236,171 @@ def get_sentiment_category(compound_score):
     else:
         return "neutral"
 
+def get_sentiment_categories(compound):
+    """Vectorized get_sentiment_category for a whole column"""
+    compound = np.asarray(compound)
+    return np.select(
+        [compound >= 0.35, compound >= 0.05, compound <= -0.35, compound <= -0.05],
+        ["very positive", "positive", "very negative", "negative"],
+        default="neutral"
+    )
+
 def load(path):
     with open(path, encoding="utf-8") as f:
+        # The scraper writes one comment per line (.jsonl); older exports are one JSON array
+        if path.endswith(".jsonl"):
+            return [json.loads(line) for line in f if line.strip()]
         return json.load(f)
 
-records = []
-total_comments = 0
-error_count = 0
+def club_name(path):
+    return pathlib.Path(path).stem.replace("comments_", "").replace("_", " ").title()
+
+def club_files(pattern="comments_*"):
+    """One comment file per club: the scraper's .jsonl store, else a legacy .json export"""
+    files = {}
+    for path in sorted(glob.glob(pattern + ".json")) + sorted(glob.glob(pattern + ".jsonl")):
+        files[club_name(path)] = path
+    return list(files.values())
+
+# Scorer of the current process, created once per worker by init_worker
+scorer = None
+
+def init_worker(backend, batch_size, num_threads=None):
+    global scorer
+    scorer = get_scorer(backend, batch_size, num_threads)
 
-for f in glob.glob("comments_*.json"):
-    club = pathlib.Path(f).stem.replace("comments_", "").replace("_", " ").title()
-    logging.info(f"Processing comments for {club}")
+def process_club_file(path):
+    """Parse and score one club file; returns a compact columnar result plus the club summary"""
+    club = club_name(path)
+    comments = load(path)
     
-    try:
-        comments = load(f)
-        total_comments += len(comments)
-        
-        for item in comments:
+    texts = [item["text"] for item in comments if isinstance(item.get("text"), str)]
+    
+    # Shared preprocessing stage, then one batched call into the selected backend
+    processed = preprocessor.preprocess_series(pd.Series(texts, dtype=object)).tolist()
+    scores = scorer.score_batch(processed)
+    
+    club_df = pd.DataFrame({"club": club, "comment": texts})
+    club_df[SCORE_COLUMNS] = scores[SCORE_COLUMNS].to_numpy()
+    club_df["sentiment"] = pd.Categorical(get_sentiment_categories(club_df["compound"]), categories=ALL_SENTIMENTS)
+    
+    for text, compound_score in zip(texts, club_df["compound"]):
+        if abs(compound_score) > 0.75:
+            logging.info(f"Strong sentiment detected ({compound_score:.3f}): {text}")
+    
+    # Running per-club summary: counts and sums are enough to build club_sentiment_summary.csv
+    summary = {
+        "club": club,
+        "n_comments": len(club_df),
+        "sum_compound": float(club_df["compound"].sum()),
+        "sum_pos": float(club_df["pos"].sum()),
+        "sum_neg": float(club_df["neg"].sum()),
+        "sum_neu": float(club_df["neu"].sum()),
+        "histogram": club_df["sentiment"].value_counts().reindex(ALL_SENTIMENTS, fill_value=0).to_dict(),
+    }
+    return {
+        "club": club,
+        "n_total": len(comments),
+        "n_errors": len(comments) - len(texts),
+        "details": club_df,
+        "summary": summary,
+        "best": club_df.nlargest(5, "compound")[["comment", "compound", "sentiment"]],
+        "worst": club_df.nsmallest(5, "compound")[["comment", "compound", "sentiment"]],
+    }
+
+def iter_club_results(files, backend, batch_size, workers):
+    """Yield club results as they complete, in-process or from a pool of worker processes"""
+    if workers <= 1:
+        init_worker(backend, batch_size)
+        for path in files:
             try:
-                text = item["text"]
-                scores = analyze_text(text)
-                compound_score = scores["compound"]
-                
-                records.append({
-                    "club": club,
-                    "comment": text,
-                    "compound": compound_score,
-                    "pos": scores["pos"],
-                    "neu": scores["neu"],
-                    "neg": scores["neg"],
-                    "sentiment": get_sentiment_category(compound_score)
-                })
+                yield process_club_file(path)
             except Exception as e:
-                error_count += 1
-                logging.error(f"Error processing comment for {club}: {str(e)}")
-                continue
-    except Exception as e:
-        logging.error(f"Error loading file for {club}: {str(e)}")
-        continue
-
-logging.info(f"Processed {total_comments} comments with {error_count} errors")
-
-df = pd.DataFrame(records)
-
-# ---- high-level dashboard ----
-# Print distribution of sentiment categories
-print("\nOverall Sentiment Distribution:")
-print(df['sentiment'].value_counts(normalize=True).round(3) * 100)
-
-# Calculate statistics with explicit float handling
-def safe_mean(x):
-    return float(x.mean())
-
-summary = df.groupby('club').agg({
-    'compound': ['size', 'mean'],
-    'pos': 'mean',
-    'neg': 'mean',
-    'neu': 'mean',
-}).round(3)
-
-# Flatten the multi-index columns
-summary.columns = ['n_comments', 'avg_compound', 'avg_pos_score', 'avg_neg_score', 'avg_neu_score']
-
-# Calculate sentiment category percentages
-all_sentiments = ["very positive", "positive", "neutral", "negative", "very negative"]
-sentiment_stats = df.groupby('club')['sentiment'].value_counts(normalize=True).unstack(fill_value=0)
-sentiment_stats = sentiment_stats.reindex(columns=all_sentiments, fill_value=0)
-sentiment_stats = sentiment_stats.round(3)
-sentiment_stats.columns = ['pct_' + col.lower().replace(' ', '_') for col in sentiment_stats.columns]
-
-# Combine the statistics
-summary = pd.concat([summary, sentiment_stats], axis=1)
-
-# Ensure all numeric columns except n_comments are float
-numeric_columns = summary.columns.drop('n_comments')
-summary[numeric_columns] = summary[numeric_columns].astype(float)
-
-# Convert percentages and round
-for col in sentiment_stats.columns:
-    summary[col] = (summary[col] * 100).round(3)
-
-# Sort by compound score
-summary = summary.sort_values("avg_compound", ascending=False)
-
-# Format the DataFrame for display and CSV output
-pd.set_option('display.float_format', '{:.3f}'.format)
-summary = summary.sort_values('avg_compound', ascending=False)
-
-# Save to CSV with proper decimal formatting
-summary.to_csv('club_sentiment_summary.csv', float_format='%.3f')
-
-# Save full details
-df.to_csv("all_comment_sentiments.csv", index=False, float_format='%.3f')
-# Format the summary for display
-print("\nSentiment Analysis Summary:")
-with pd.option_context('display.float_format', '{:.3f}'.format):
-    print(summary)
-
-# show top 5 most positive / negative per club
-for club, grp in df.groupby("club"):
-    best = grp.nlargest(5, "compound")[["comment", "compound", "sentiment"]]
-    worst = grp.nsmallest(5, "compound")[["comment", "compound", "sentiment"]]
-    print(f"\n—— {club.upper()} ——")
-    print("Top 5 positive comments:")
-    print(best.to_string(index=False))
-    print("\nTop 5 negative comments:")
-    print(worst.to_string(index=False))
\ No newline at end of file
+                logging.error(f"Error loading file for {club_name(path)}: {str(e)}")
+        return
+    
+    # Split the cores between the workers to avoid oversubscribing torch threads
+    num_threads = max(1, (os.cpu_count() or 1) // workers)
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker,
+                             initargs=(backend, batch_size, num_threads)) as executor:
+        futures = {executor.submit(process_club_file, path): path for path in files}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                logging.error(f"Error loading file for {club_name(futures[future])}: {str(e)}")
+
+def build_summary(club_summaries):
+    """Build the club summary table from the per-club counts and sums"""
+    summary = pd.DataFrame(club_summaries).set_index("club")
+    # Clubs without a valid comment have no averages (the old groupby left them out as well)
+    summary = summary[summary["n_comments"] > 0]
+    n = summary["n_comments"]
+    result = pd.DataFrame({
+        "n_comments": n,
+        "avg_compound": summary["sum_compound"] / n,
+        "avg_pos_score": summary["sum_pos"] / n,
+        "avg_neg_score": summary["sum_neg"] / n,
+        "avg_neu_score": summary["sum_neu"] / n,
+    }).round(3)
+    histogram = pd.DataFrame(list(summary["histogram"]), index=summary.index).reindex(columns=ALL_SENTIMENTS, fill_value=0)
+    for sentiment in ALL_SENTIMENTS:
+        result['pct_' + sentiment.replace(' ', '_')] = ((histogram[sentiment] / n).round(3) * 100).round(3)
+    return result.sort_values("avg_compound", ascending=False)
+
+def main():
+    args = parse_args()
+    logging.info(f"Using sentiment backend: {args.backend} with {args.workers} worker(s)")
+    
+    files = club_files()
+    club_summaries = []
+    extremes = {}
+    total_comments = 0
+    error_count = 0
+    details_written = False
+    
+    for result in iter_club_results(files, args.backend, args.batch_size, args.workers):
+        logging.info(f"Processed comments for {result['club']}")
+        total_comments += result["n_total"]
+        error_count += result["n_errors"]
+        club_summaries.append(result["summary"])
+        if result["summary"]["n_comments"]:
+            extremes[result["club"]] = (result["best"], result["worst"])
+        
+        # Stream the details to disk instead of keeping all comments in memory
+        result["details"].to_csv(DETAILS_FILE, mode="a" if details_written else "w", header=not details_written,
+                                 index=False, float_format='%.3f')
+        details_written = True
+    
+    logging.info(f"Processed {total_comments} comments with {error_count} errors")
+    if not club_summaries:
+        logging.warning("No comment files could be processed.")
+        return
+    
+    # ---- high-level dashboard ----
+    # Print distribution of sentiment categories
+    overall = pd.DataFrame([s["histogram"] for s in club_summaries]).sum()
+    print("\nOverall Sentiment Distribution:")
+    print((overall / overall.sum()).sort_values(ascending=False).round(3) * 100)
+    
+    summary = build_summary(club_summaries)
+    
+    # Save to CSV with proper decimal formatting
+    summary.to_csv(SUMMARY_FILE, float_format='%.3f')
+    
+    # Format the summary for display
+    print("\nSentiment Analysis Summary:")
+    with pd.option_context('display.float_format', '{:.3f}'.format):
+        print(summary)
+    
+    # show top 5 most positive / negative per club
+    for club in sorted(extremes):
+        best, worst = extremes[club]
+        print(f"\n—— {club.upper()} ——")
+        print("Top 5 positive comments:")
+        print(best.to_string(index=False))
+        print("\nTop 5 negative comments:")
+        print(worst.to_string(index=False))
+
+if __name__ == "__main__":
+    main()
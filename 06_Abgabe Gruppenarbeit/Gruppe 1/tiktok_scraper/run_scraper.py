@@ -1,10 +1,14 @@
 import asyncio
 from playwright.async_api import async_playwright
+import argparse
+import hashlib
 import json
 import logging
 import sys
+from dataclasses import dataclass, asdict
 from datetime import datetime
 import os
+import time
 
 # Configure detailed logging
 logging.basicConfig(
@@ -17,6 +21,185 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+DEFAULT_URL = "https://www.tiktok.com/@werderbremen/video/7497250601093451030"
+USER_AGENT = 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
+COMMENT_ITEM_SELECTOR = 'div[class*="DivCommentItem"], div[data-e2e="comment-item"], [data-e2e="comment-level-1"]'
+COMMENT_LIST_SELECTOR = 'div[class*="DivCommentListContainer"], div[class*="CommentScrollContainer"], div[data-e2e="comment-list"]'
+# Comment list (and reply list) endpoints the web app calls while the comment panel is scrolled
+COMMENT_API_PATH = '/api/comment/list/'
+
+class CommentStore:
+    """Append-only JSON Lines sink for comments.
+
+    Every comment is written exactly once: ids already in the file (from an earlier, possibly
+    crashed run) or seen in this run are skipped. Lines are buffered and flushed after
+    flush_every comments or flush_interval seconds, whichever comes first. A legacy
+    comments_<name>.json export next to the file is imported once and renamed to *.json.migrated.
+    """
+
+    def __init__(self, path, flush_every=200, flush_interval=5.0):
+        self.path = os.path.abspath(path)
+        self.flush_every = flush_every
+        self.flush_interval = flush_interval
+        self.seen = set()
+        self.buffer = []
+        self.added = 0
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self.resumed = self._load_existing()
+        self.file = open(self.path, 'a', encoding='utf-8')
+        self.last_flush = time.monotonic()
+        self.resumed += self._migrate_legacy()
+        if self.resumed:
+            logger.info(f"Resuming {self.path}: {self.resumed} comments already stored")
+
+    @staticmethod
+    def comment_key(comment):
+        # DOM-extracted comments carry no id, so they are keyed by author and text
+        if comment.get('id'):
+            return str(comment['id'])
+        return hashlib.sha1(f"{comment.get('author')}\x00{comment.get('text')}".encode('utf-8')).hexdigest()
+
+    def _load_existing(self):
+        """Read the ids of stored comments and cut off a line torn by a crash"""
+        if not os.path.exists(self.path):
+            return 0
+        valid_bytes = 0
+        with open(self.path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    self.seen.add(self.comment_key(json.loads(line)))
+                except ValueError:
+                    break
+                valid_bytes += len(line)
+        if os.path.getsize(self.path) > valid_bytes:
+            logger.warning(f"Truncating incomplete data at the end of {self.path}")
+            with open(self.path, 'r+b') as f:
+                f.truncate(valid_bytes)
+        return len(self.seen)
+
+    def _migrate_legacy(self):
+        """Import the JSON array written by the old save_comments() and retire that file"""
+        legacy_path = os.path.splitext(self.path)[0] + '.json'
+        if not os.path.exists(legacy_path):
+            return 0
+        with open(legacy_path, 'r', encoding='utf-8') as f:
+            imported = self.add_many(json.load(f))
+        self.flush()
+        self.added = 0
+        os.replace(legacy_path, legacy_path + '.migrated')
+        logger.info(f"Imported {imported} comments from {legacy_path} into {self.path}")
+        return imported
+
+    def __len__(self):
+        return len(self.seen)
+
+    def add(self, comment):
+        """Queue a comment for writing; returns False if it is already stored"""
+        key = self.comment_key(comment)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.buffer.append(json.dumps(comment, ensure_ascii=False))
+        self.added += 1
+        if len(self.buffer) >= self.flush_every or time.monotonic() - self.last_flush >= self.flush_interval:
+            self.flush()
+        return True
+
+    def add_many(self, comments):
+        return sum(self.add(comment) for comment in comments)
+
+    def flush(self):
+        if self.buffer:
+            self.file.write('\n'.join(self.buffer) + '\n')
+            self.file.flush()
+            os.fsync(self.file.fileno())
+            self.buffer = []
+        self.last_flush = time.monotonic()
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        logger.info(f"Saved {self.added} new comments to {self.path} ({len(self.seen)} stored in total)")
+
+@dataclass
+class CommentRecord:
+    """One comment as parsed from the comment-list API payload"""
+    id: str
+    text: str
+    author: str
+    like_count: int
+    create_time: str
+    reply_count: int
+    scraped_at: str
+
+    @classmethod
+    def from_api(cls, item):
+        user = item.get('user') or {}
+        create_time = item.get('create_time')
+        return cls(
+            id=str(item.get('cid')),
+            text=(item.get('text') or '').strip(),
+            author=user.get('unique_id') or user.get('nickname') or 'Anonymous',
+            like_count=int(item.get('digg_count') or 0),
+            create_time=datetime.fromtimestamp(create_time).isoformat() if create_time else None,
+            reply_count=int(item.get('reply_comment_total') or 0),
+            scraped_at=datetime.now().isoformat()
+        )
+
+class CommentResponseCollector:
+    """Collects comments from the page's comment-list JSON responses via Playwright response events"""
+
+    def __init__(self, page):
+        self.records = {}
+        self.store = None  # CommentStore that receives records as soon as they are intercepted
+        self.has_more = True
+        self.total = None
+        self.updated = asyncio.Event()
+        page.on("response", self.handle_response)
+
+    def __len__(self):
+        return len(self.records)
+
+    async def handle_response(self, response):
+        if COMMENT_API_PATH not in response.url:
+            return
+        try:
+            payload = await response.json()
+        except Exception as e:
+            logger.warning(f"Could not parse comment response: {str(e)}")
+            return
+        
+        new_records = 0
+        for item in payload.get('comments') or []:
+            if not item.get('cid') or not item.get('text'):
+                continue
+            if item['cid'] not in self.records:
+                self.records[item['cid']] = CommentRecord.from_api(item)
+                new_records += 1
+                if self.store is not None:
+                    self.store.add(asdict(self.records[item['cid']]))
+        
+        # Only the top-level list decides whether scrolling can load anything more
+        if '/reply/' not in response.url:
+            self.has_more = bool(payload.get('has_more'))
+            self.total = payload.get('total', self.total)
+        logger.info(f"Intercepted {new_records} new comments ({len(self.records)}/{self.total or '?'} total)")
+        self.updated.set()
+
+    async def wait_for_update(self, timeout=5000):
+        """Wait until the next comment response arrived; returns False on timeout"""
+        self.updated.clear()
+        try:
+            await asyncio.wait_for(self.updated.wait(), timeout / 1000)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def comments(self):
+        return [asdict(record) for record in self.records.values()]
+
 class TikTokScraper:
     def __init__(self):
         self.comments = []
@@ -40,7 +223,10 @@ class TikTokScraper:
                     if cookie_button:
                         await cookie_button.click()
                         logger.info(f"Clicked cookie button with selector: {button_selector}")
-                        await asyncio.sleep(3)
+                        try:
+                            await cookie_button.wait_for_element_state("hidden", timeout=5000)
+                        except Exception:
+                            pass
                         return True
                 except Exception:
                     continue
@@ -68,7 +254,10 @@ class TikTokScraper:
                     logger.info("⚠️ CAPTCHA detected! Please solve it manually...")
                     await page.wait_for_selector(selector, state="hidden", timeout=180000)  # 3 minutes
                     logger.info("Captcha appears to be solved!")
-                    await asyncio.sleep(5)  # Wait longer after captcha
+                    try:
+                        await page.wait_for_load_state("networkidle", timeout=15000)
+                    except Exception:
+                        pass
                     return True
             except Exception:
                 continue
@@ -91,7 +280,6 @@ class TikTokScraper:
         try:
             # Wait for the video page to be properly loaded
             await page.wait_for_selector('div[class*="DivVideoWrapper"]', timeout=10000)
-            await asyncio.sleep(2)
 
             # Use exact button structure from the TikTok page
             button = await page.wait_for_selector('button[class*="css-1ok4pbl-ButtonActionItem"][aria-label*="Kommentare lesen oder hinzufügen"]', timeout=10000)
@@ -105,19 +293,14 @@ class TikTokScraper:
                     await page.evaluate("(button) => button.click()", button)
                 
                 logger.info("Clicked comment button")
-                await asyncio.sleep(3)
                 
                 # Verify comments are visible
-                comment_list_selectors = [
-                    'div[class*="DivCommentListContainer"]',
-                    'div[class*="CommentScrollContainer"]',
-                    'div[data-e2e="comment-list"]'
-                ]
-                
-                for list_selector in comment_list_selectors:
-                    if await page.query_selector(list_selector):
-                        logger.info("Comment section is now visible")
-                        return True
+                try:
+                    await page.wait_for_selector(COMMENT_LIST_SELECTOR, timeout=10000)
+                    logger.info("Comment section is now visible")
+                    return True
+                except Exception:
+                    pass
             
             # If button wasn't found, check if comments are already visible
             already_visible_selectors = [
@@ -199,14 +382,33 @@ class TikTokScraper:
             logger.error(f"Error extracting comment data: {str(e)}")
             return None
 
-    async def scroll_to_load_comments(self, page):
-        """Scroll gradually to load all comments"""
+    async def wait_for_comment_count(self, page, previous_count, timeout=5000):
+        """Wait until more comments are rendered than before, or until the network is idle"""
+        try:
+            await page.wait_for_function(
+                "([selector, count]) => document.querySelectorAll(selector).length > count",
+                arg=[COMMENT_ITEM_SELECTOR, previous_count],
+                timeout=timeout
+            )
+        except Exception:
+            # Nothing new rendered yet: let pending comment requests settle before giving up on this scroll
+            try:
+                await page.wait_for_load_state("networkidle", timeout=timeout)
+            except Exception:
+                pass
+
+    async def scroll_to_load_comments(self, page, collector=None):
+        """Scroll gradually to load all comments.
+
+        With a collector, progress is measured on the intercepted API responses and scrolling
+        continues until the API reports no further pages.
+        """
         logger.info("Starting to scroll for comments...")
         previous_comment_count = 0
         no_new_comments_count = 0
         max_attempts_without_new = 3
         total_scrolls = 0
-        max_total_scrolls = 15
+        max_total_scrolls = 15 if collector is None else 500
 
         # First locate the comment container
         container_selectors = [
@@ -222,8 +424,9 @@ class TikTokScraper:
                 container = await page.query_selector(selector)
                 if container:
                     # Verify it's a comment container
-                    comments = await container.query_selector_all('div[class*="DivCommentItem"], div[data-e2e="comment-item"], [data-e2e="comment-level-1"]')
+                    comments = await container.query_selector_all(COMMENT_ITEM_SELECTOR)
                     if len(comments) > 0:
+                        previous_comment_count = len(collector) if collector is not None else len(comments)
                         container_selector = selector
                         logger.info(f"Found comment container with selector: {selector}")
                         break
@@ -236,6 +439,9 @@ class TikTokScraper:
 
         # Scroll the container
         while total_scrolls < max_total_scrolls and no_new_comments_count < max_attempts_without_new:
+            if collector is not None and len(collector) and not collector.has_more:
+                logger.info("Comment API reports no further pages")
+                break
             try:
                 # More aggressive scrolling
                 await page.evaluate(f"""() => {{
@@ -252,17 +458,19 @@ class TikTokScraper:
                     }}
                 }}""")
                 
-                await asyncio.sleep(2)
-
-                # Count comments with updated selectors
-                comments = await page.query_selector_all('div[class*="DivCommentItem"], div[data-e2e="comment-item"], [data-e2e="comment-level-1"]')
-                current_count = len(comments)
+                # Wait for the comment count to change instead of sleeping a fixed time
+                if collector is not None:
+                    await collector.wait_for_update()
+                    current_count = len(collector)
+                else:
+                    await self.wait_for_comment_count(page, previous_comment_count)
+                    # Count comments without fetching a handle for every element
+                    current_count = await page.locator(COMMENT_ITEM_SELECTOR).count()
                 logger.info(f"Found {current_count} comments after scroll {total_scrolls + 1}")
                 
                 if current_count > previous_comment_count:
                     no_new_comments_count = 0
                     logger.info(f"Found {current_count - previous_comment_count} new comments")
-                    await asyncio.sleep(1)
                 else:
                     no_new_comments_count += 1
                     logger.info(f"No new comments found (attempt {no_new_comments_count}/{max_attempts_without_new})")
@@ -276,54 +484,35 @@ class TikTokScraper:
 
         return previous_comment_count
 
-    async def save_comments(self, output_file='comments.json'):
-        """Save comments with verification"""
-        if not self.comments:
-            logger.error("No comments to save!")
-            return False
-            
-        try:
-            # Ensure we have a valid path
-            output_path = os.path.abspath(output_file)
-            os.makedirs(os.path.dirname(output_path), exist_ok=True)
-            
-            # Save with pretty printing
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(self.comments, f, ensure_ascii=False, indent=2)
-            
-            # Verify the save
-            if os.path.exists(output_path):
-                with open(output_path, 'r', encoding='utf-8') as f:
-                    saved_data = json.load(f)
-                    if len(saved_data) == len(self.comments):
-                        logger.info(f"Successfully saved {len(self.comments)} comments to {output_path}")
-                        # Print first few comments as verification
-                        for i, comment in enumerate(saved_data[:3]):
-                            logger.info(f"Sample comment {i+1}: {comment['text'][:50]}...")
-                        return True
-                    else:
-                        logger.error(f"Save verification failed! Found {len(saved_data)} comments in file but expected {len(self.comments)}")
-                        return False
-            else:
-                logger.error(f"Failed to save comments! File {output_path} does not exist")
-                return False
-                
-        except Exception as e:
-            logger.error(f"Error saving comments: {str(e)}")
-            return False
+    async def extract_comments(self, page, output_file='comments.jsonl', open_comments=False, handle_cookies=True,
+                               collector=None):
+        """Load, extract and save the comments of one video page; returns the extracted comments.
 
-    async def extract_comments(self, page):
+        Comments are appended to a CommentStore at output_file while they are extracted. If a
+        CommentResponseCollector is attached to the page, the comments are taken from the
+        intercepted API responses; the DOM selectors are only used when nothing was intercepted.
+        """
+        comments_data = []
+        store = CommentStore(output_file)
+        if collector is not None:
+            # Records intercepted during navigation are stored now, later ones as they arrive
+            store.add_many(collector.comments())
+            collector.store = store
         try:
             logger.info("Waiting for page to load...")
             await page.wait_for_load_state("domcontentloaded")
-            await asyncio.sleep(3)
             
-            # Handle cookie banner if present
-            await self.handle_cookie_banner(page)
+            # Handle cookie banner if present (only needed once per browser context)
+            if handle_cookies:
+                await self.handle_cookie_banner(page)
             
             # Check for and handle captcha
             await self.wait_for_captcha(page)
             
+            # In batch mode nobody is there to open the comments by hand
+            if open_comments:
+                await self.click_comment_section(page)
+            
             # Wait for manually opened comments section
             logger.info("Waiting for comments to be visible (please open comments manually)...")
             comment_selectors = [
@@ -344,64 +533,81 @@ class TikTokScraper:
 
             if not comment_container_found:
                 logger.error("Could not find visible comments! Please make sure comments are opened.")
-                return
+                return comments_data
             
             # Scroll to load all comments
-            total_comments = await self.scroll_to_load_comments(page)
+            total_comments = await self.scroll_to_load_comments(page, collector)
+            
+            if collector is not None and len(collector):
+                comments_data = collector.comments()
+                logger.info(f"Successfully extracted {len(comments_data)} comments from network responses")
+                return comments_data
+            if collector is not None:
+                logger.warning("No comment responses intercepted, falling back to DOM extraction")
+                total_comments = await page.locator(COMMENT_ITEM_SELECTOR).count()
+            
             if total_comments == 0:
                 logger.error("No comments found after scrolling!")
-                return
+                return comments_data
             
             # Get all comments after scrolling is complete
             comments = await page.query_selector_all("div[data-e2e='comment-item'], div[class*='CommentItem'], div[class*='DivCommentItemContainer']")
             logger.info(f"Found {len(comments)} total comments")
             
             # Extract data from each comment
-            self.comments = []  # Reset comments list before extraction
             for index, comment in enumerate(comments, 1):
                 comment_data = await self.extract_comment_data(comment)
                 if comment_data and comment_data['text']:  # Only add if we have valid text
-                    self.comments.append(comment_data)
+                    comments_data.append(comment_data)
+                    store.add(comment_data)
                     logger.info(f"Processed comment {index}: {comment_data['text'][:50]}...")
             
-            logger.info(f"Successfully extracted {len(self.comments)} comments")
-            
-            # Save comments
-            if self.comments:
-                await self.save_comments('comments.json')
-            else:
+            logger.info(f"Successfully extracted {len(comments_data)} comments")
+            if not comments_data:
                 logger.error("No valid comments were extracted to save!")
+            return comments_data
                 
         except Exception as e:
             logger.error(f"Error during comment extraction: {str(e)}")
             raise
+        finally:
+            if collector is not None:
+                collector.store = None
+            store.close()
 
-    async def run(self, url):
+    async def launch_browser(self, p, headless=False):
+        logger.info("Launching browser...")
+        return await p.chromium.launch(
+            headless=headless,
+            args=[
+                '--no-sandbox',
+                '--disable-dev-shm-usage',
+                '--disable-blink-features=AutomationControlled',
+                '--disable-site-isolation-trials'
+            ]
+        )
+
+    async def new_context(self, browser):
+        return await browser.new_context(
+            viewport=None,
+            java_script_enabled=True,
+            user_agent=USER_AGENT
+        )
+
+    async def run(self, url, output_file='comments.jsonl', headless=False, extraction='network'):
         logger.info(f"Starting scraper for URL: {url}")
         async with async_playwright() as p:
             try:
-                logger.info("Launching browser...")
-                browser = await p.chromium.launch(
-                    headless=False,
-                    args=[
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                        '--disable-blink-features=AutomationControlled',
-                        '--disable-site-isolation-trials'
-                    ]
-                )
-                
-                context = await browser.new_context(
-                    viewport=None,
-                    java_script_enabled=True,
-                    user_agent='Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
-                )
+                browser = await self.launch_browser(p, headless)
+                context = await self.new_context(browser)
                 
                 page = await context.new_page()
+                # Listen before navigating so the first comment page is captured as well
+                collector = CommentResponseCollector(page) if extraction == 'network' else None
                 
                 try:
                     await page.goto(url, wait_until='networkidle')  # Wait for network to be idle
-                    await self.extract_comments(page)
+                    self.comments = await self.extract_comments(page, output_file, collector=collector)
                 except Exception as e:
                     logger.error(f"Error during scraping: {str(e)}")
                     raise
@@ -413,21 +619,102 @@ class TikTokScraper:
                 logger.error(f"Fatal error: {str(e)}")
                 raise
 
+    async def run_batch(self, videos, concurrency=4, headless=False, extraction='network'):
+        """Harvest several videos over one shared browser with a bounded pool of contexts.
+
+        videos is a list of (url, output_file) tuples. Each video is written to its own
+        file as soon as it is done; returns a dict url -> number of saved comments.
+        """
+        logger.info(f"Starting batch scraper for {len(videos)} videos with up to {concurrency} parallel pages")
+        results = {}
+        async with async_playwright() as p:
+            browser = await self.launch_browser(p, headless)
+            
+            # Contexts are reused across videos so the cookie banner only has to be handled once per context
+            contexts = asyncio.Queue()
+            for _ in range(max(1, min(concurrency, len(videos)))):
+                contexts.put_nowait(await self.new_context(browser))
+            cookies_handled = set()
+            
+            async def harvest(url, output_file):
+                context = await contexts.get()
+                page = await context.new_page()
+                collector = CommentResponseCollector(page) if extraction == 'network' else None
+                try:
+                    await page.goto(url, wait_until='domcontentloaded')
+                    comments = await self.extract_comments(
+                        page, output_file, open_comments=True, handle_cookies=id(context) not in cookies_handled,
+                        collector=collector
+                    )
+                    cookies_handled.add(id(context))
+                    results[url] = len(comments)
+                    logger.info(f"Finished {url}: {len(comments)} comments ({len(results)}/{len(videos)} videos done)")
+                except Exception as e:
+                    logger.error(f"Error during scraping of {url}: {str(e)}")
+                    results[url] = 0
+                finally:
+                    await page.close()
+                    contexts.put_nowait(context)
+            
+            try:
+                await asyncio.gather(*(harvest(url, output_file) for url, output_file in videos))
+            finally:
+                while not contexts.empty():
+                    await contexts.get_nowait().close()
+                await browser.close()
+        
+        logger.info(f"Batch finished: {sum(results.values())} comments from {len(results)} videos")
+        return results
+
+def load_video_list(path):
+    """Read a video list file: one URL per line, optionally prefixed by a name (e.g. 'werder_bremen <url>')"""
+    videos = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            parts = line.split()
+            videos.append((parts[-1], parts[0] if len(parts) > 1 else None))
+    return videos
+
+def get_output_file(url, name=None, output_dir='.'):
+    # Extract video ID from URL
+    video_id = url.rstrip('/').split('/')[-1].split('?')[0]
+    return os.path.join(output_dir, f'comments_{name or video_id}.jsonl')
+
 async def main():
+    parser = argparse.ArgumentParser(description='Scrape TikTok comments for one or more videos')
+    parser.add_argument('urls', nargs='*', help='Video URLs to scrape')
+    parser.add_argument('--urls-file', help="File with one video URL per line, optionally as '<name> <url>'")
+    parser.add_argument('--concurrency', type=int, default=4, help='Number of videos scraped in parallel in batch mode')
+    parser.add_argument('--output-dir', default='.', help='Directory for the comments_<name>.jsonl files (existing files are resumed)')
+    parser.add_argument('--headless', action='store_true', help='Run the browser headless (no manual captcha solving)')
+    parser.add_argument('--extraction', default='network', choices=['network', 'dom'],
+                        help='network: parse the intercepted comment API responses (DOM only as fallback); dom: CSS selectors only')
+    args = parser.parse_args()
+    
     try:
         scraper = TikTokScraper()
-        url = "https://www.tiktok.com/@werderbremen/video/7497250601093451030"
-        
-        # Extract video ID from URL
-        video_id = url.split('/')[-1]
-        output_file = f'comments_{video_id}.json'
+        videos = [(url, None) for url in args.urls]
+        if args.urls_file:
+            videos.extend(load_video_list(args.urls_file))
         
-        await scraper.run(url)
-        # Save to the specific output file
-        await scraper.save_comments(output_file)
+        if len(videos) <= 1 and not args.urls_file:
+            url = videos[0][0] if videos else DEFAULT_URL
+            output_file = get_output_file(url, output_dir=args.output_dir)
+            await scraper.run(url, output_file, headless=args.headless, extraction=args.extraction)
+        else:
+            os.makedirs(args.output_dir, exist_ok=True)
+            await scraper.run_batch(
+                [(url, get_output_file(url, name, args.output_dir)) for url, name in videos],
+                concurrency=args.concurrency,
+                headless=args.headless,
+                extraction=args.extraction
+            )
     except Exception as e:
         logger.error(f"Script failed: {str(e)}")
         sys.exit(1)
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+aggregate_sentiment.py - Zusammenführen der Chunk-Sentiments zu Reden, Parteien und Sitzungen
+
+Liest die bewerteten Chunks aus 'bundestagsreden_chunks_sentiment.csv' (oder
+einem Parquet-Ordner aus stream_chunk_scoring.py) und berechnet pro Rede
+(text_id) token-gewichtete Mittelwerte der Wahrscheinlichkeiten. Tokens, die
+wegen der Überlappung in zwei Chunks vorkommen, zählen in jedem Chunk nur zur
+Hälfte. Anschliessend wird pro Partei und pro Sitzung aggregiert, wobei jede
+Rede genau eine Stimme hat.
+
+Datum: 17.10.2026
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+# Konfiguration
+INPUT_FILE = "bundestagsreden_chunks_sentiment.csv"
+SPEECH_OUTPUT_FILE = "bundestagsreden_sentiment_pro_rede.csv"
+PARTY_OUTPUT_FILE = "bundestagsreden_sentiment_pro_partei.csv"
+SESSION_OUTPUT_FILE = "bundestagsreden_sentiment_pro_sitzung.csv"
+OVERLAP = 50  # muss zu split_texts_to_chunks.py passen
+PARTY_COLUMN = "speaker_party"
+SESSION_COLUMN = "session"  # Spalte mit der Sitzungsnummer in der Eingabe-CSV
+META_COLUMNS = ["speaker", PARTY_COLUMN, SESSION_COLUMN]
+LABELS = ["POSITIVE", "NEUTRAL", "NEGATIVE"]
+PROB_COLUMNS = [f"{label.lower()}_prob" for label in LABELS]
+
+def load_chunks(path):
+    if os.path.isdir(path):
+        return pd.read_parquet(path)
+    return pd.read_csv(path)
+
+def chunk_weights(df):
+    """Token-Gewicht je Chunk; jede Überlappung mit einem Nachbar-Chunk zählt zur Hälfte."""
+    neighbours = (df["chunk_number"] > 1).astype(int) + (df["chunk_number"] < df["total_chunks"]).astype(int)
+    return (df["token_count"] - 0.5 * OVERLAP * neighbours).clip(lower=1)
+
+def aggregate_speeches(df):
+    """Fasst alle Chunks einer Rede zu token-gewichteten Wahrscheinlichkeiten zusammen."""
+    weights = chunk_weights(df)
+    weighted = df[PROB_COLUMNS].mul(weights, axis=0)
+    weighted["weight"] = weights
+    weighted["text_id"] = df["text_id"].to_numpy()
+
+    sums = weighted.groupby("text_id", sort=False).sum()
+    speeches = sums[PROB_COLUMNS].div(sums["weight"], axis=0)
+    speeches["sentiment"] = np.array(LABELS)[speeches[PROB_COLUMNS].to_numpy().argmax(axis=1)]
+    speeches["confidence"] = speeches[PROB_COLUMNS].to_numpy().max(axis=1)
+    speeches["chunks"] = df.groupby("text_id", sort=False).size()
+    speeches["weighted_tokens"] = sums["weight"]
+
+    meta = [col for col in META_COLUMNS if col in df.columns]
+    if meta:
+        speeches = speeches.join(df.groupby("text_id", sort=False)[meta].first())
+    return speeches.reset_index()
+
+def rollup(speeches, column):
+    """Mittlere Wahrscheinlichkeiten und Sentiment-Anteile (in %) je Gruppe, eine Stimme pro Rede."""
+    grouped = speeches.groupby(column)
+    summary = grouped[PROB_COLUMNS].mean()
+    summary.insert(0, "speeches", grouped.size())
+
+    shares = pd.crosstab(speeches[column], speeches["sentiment"], normalize="index") * 100
+    shares = shares.reindex(columns=LABELS, fill_value=0.0)
+    shares.columns = [f"{label.lower()}_pct" for label in LABELS]
+    return summary.join(shares).reset_index()
+
+def main():
+    print(f"📄 Lade Chunks aus '{INPUT_FILE}'...")
+    try:
+        df = load_chunks(INPUT_FILE)
+        print(f"✅ {len(df)} Chunks gefunden.")
+    except Exception as e:
+        print(f"❌ Fehler beim Laden der Daten: {e}")
+        return
+
+    speeches = aggregate_speeches(df)
+    speeches.to_csv(SPEECH_OUTPUT_FILE, index=False)
+    print(f"📀 {len(speeches)} Reden gespeichert in '{SPEECH_OUTPUT_FILE}'")
+
+    for column, output_file in [(PARTY_COLUMN, PARTY_OUTPUT_FILE), (SESSION_COLUMN, SESSION_OUTPUT_FILE)]:
+        if column not in speeches.columns:
+            print(f"⚠️ Spalte '{column}' nicht vorhanden, überspringe '{output_file}'")
+            continue
+        summary = rollup(speeches, column)
+        summary.to_csv(output_file, index=False)
+        print(f"📀 {len(summary)} Gruppen gespeichert in '{output_file}'")
+
+    print("✅ Aggregation abgeschlossen!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+benchmark_quantization.py - Vergleich fp32 vs. int8 für German Sentiment BERT
+
+Bewertet eine Stichprobe aus 'bundestag_reden_tokenized_chunks.csv' einmal mit
+dem fp32-Modell und einmal mit dem dynamisch quantisierten int8-Modell und gibt
+Durchsatz, Label-Übereinstimmung und mittlere Abweichung der Wahrscheinlichkeiten aus.
+
+Datum: 17.10.2026
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from transformers import AutoTokenizer
+
+from sentiment_analysis_bert import score_dataframe, LABELS
+from sentiment_cpu_pool import load_cpu_model, MODEL_NAME
+
+# Konfiguration
+INPUT_FILE = "bundestag_reden_tokenized_chunks.csv"
+SAMPLE_SIZE = 1000
+BATCH_SIZE = 32
+RANDOM_STATE = 42
+
+def run(df, tokenizer, quantize):
+    model = load_cpu_model(quantize)
+    start_time = time.perf_counter()
+    df_scored = score_dataframe(df, tokenizer, model, torch.device("cpu"), BATCH_SIZE)
+    elapsed = time.perf_counter() - start_time
+    return df_scored, len(df_scored) / elapsed
+
+def main():
+    print(f"📄 Lade Stichprobe aus '{INPUT_FILE}'...")
+    df = pd.read_csv(INPUT_FILE)
+    df = df[df["text"].notna() & (df["text"].str.len() > 20)]
+    df = df.sample(min(SAMPLE_SIZE, len(df)), random_state=RANDOM_STATE)
+    print(f"✅ {len(df)} Chunks, {torch.get_num_threads()} Threads")
+
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+
+    print("\n🚀 fp32...")
+    df_fp32, throughput_fp32 = run(df, tokenizer, quantize=False)
+    print("\n🚀 int8...")
+    df_int8, throughput_int8 = run(df, tokenizer, quantize=True)
+
+    prob_columns = [f"{label.lower()}_prob" for label in LABELS]
+    agreement = (df_fp32["sentiment"].to_numpy() == df_int8["sentiment"].to_numpy()).mean()
+    prob_diff = np.abs(df_fp32[prob_columns].to_numpy() - df_int8[prob_columns].to_numpy()).mean()
+
+    print("\n📊 Ergebnis:")
+    print(f"  - fp32: {throughput_fp32:.1f} Chunks/s")
+    print(f"  - int8: {throughput_int8:.1f} Chunks/s (x{throughput_int8 / throughput_fp32:.2f})")
+    print(f"  - Label-Übereinstimmung: {agreement * 100:.2f}%")
+    print(f"  - Mittlere Abweichung der Wahrscheinlichkeiten: {prob_diff:.4f}")
+    print("\n📋 Kreuztabelle fp32 (Zeilen) vs. int8 (Spalten):")
+    print(pd.crosstab(df_fp32["sentiment"].to_numpy(), df_int8["sentiment"].to_numpy()))
+
+if __name__ == "__main__":
+    main()
@@ -13,17 +13,119 @@ Datum: 04.05.2025
 import pandas as pd
 import numpy as np
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification, pipeline
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
 import matplotlib.pyplot as plt
 import seaborn as sns
 from tqdm import tqdm
+import time
 import os
 
+from aggregate_sentiment import aggregate_speeches
+from sentiment_cache import SentimentCache
+
 # Konfiguration
 MODEL_NAME = "oliverguhr/german-sentiment-bert"
 INPUT_FILE = "bundestag_reden_tokenized_chunks.csv"
 OUTPUT_FILE = "bundestagsreden_chunks_sentiment.csv"
 VISUALIZE_RESULTS = True
+USE_CACHE = True
+CACHE_FILE = "sentiment_cache.sqlite"
+BATCH_SIZE = 32
+MAX_MODEL_TOKENS = 512
+LABELS = ["POSITIVE", "NEUTRAL", "NEGATIVE"]
+
+def get_label_indices(model):
+    """Liefert die Indizes der Modell-Logits in der Reihenfolge von LABELS."""
+    label_to_index = {label.upper(): int(i) for i, label in model.config.id2label.items()}
+    return [label_to_index[label] for label in LABELS]
+
+def encode_texts(tokenizer, texts):
+    """Tokenisiert alle Texte in einem Batch-Aufruf (ohne Padding)."""
+    return tokenizer(list(texts), add_special_tokens=True, truncation=False)["input_ids"]
+
+def parse_input_ids(series):
+    """Liest die vom Chunker gespeicherten Token-IDs (leerzeichengetrennt) wieder ein."""
+    return [[int(token) for token in ids.split()] for ids in series]
+
+def predict_batched(model, input_ids, pad_token_id, device, batch_size=BATCH_SIZE):
+    """
+    Berechnet Softmax-Wahrscheinlichkeiten für bereits tokenisierte Texte.
+
+    Die Texte werden nach Länge sortiert und in Batches aufgeteilt, jeder Batch
+    wird nur bis zu seinem längsten Element aufgefüllt. Rückgabe ist ein Array
+    der Form (len(input_ids), len(LABELS)) in der ursprünglichen Reihenfolge.
+    """
+    label_indices = get_label_indices(model)
+    order = np.argsort([len(ids) for ids in input_ids], kind="stable")
+    probs = np.zeros((len(input_ids), len(LABELS)), dtype=np.float32)
+
+    model.eval()
+    with torch.inference_mode():
+        for start in tqdm(range(0, len(order), batch_size), total=-(-len(order) // batch_size)):
+            batch_idx = order[start:start + batch_size]
+            max_len = max(len(input_ids[i]) for i in batch_idx)
+
+            ids = torch.full((len(batch_idx), max_len), pad_token_id, dtype=torch.long)
+            attention_mask = torch.zeros((len(batch_idx), max_len), dtype=torch.long)
+            for row, i in enumerate(batch_idx):
+                seq = input_ids[i]
+                ids[row, :len(seq)] = torch.as_tensor(seq, dtype=torch.long)
+                attention_mask[row, :len(seq)] = 1
+
+            logits = model(input_ids=ids.to(device), attention_mask=attention_mask.to(device)).logits
+            batch_probs = torch.softmax(logits.float(), dim=-1)[:, label_indices]
+            probs[batch_idx] = batch_probs.cpu().numpy()
+
+    return probs
+
+def score_dataframe(df, tokenizer, model, device, batch_size=BATCH_SIZE, cache=None):
+    """
+    Bewertet alle Texte eines DataFrames und hängt die Sentiment-Spalten an.
+
+    Liegen bereits Token-IDs aus split_texts_to_chunks.py vor (Spalte
+    'input_ids'), werden diese direkt verwendet. Texte mit mehr als
+    MAX_MODEL_TOKENS Tokens werden übersprungen. Mit einem SentimentCache
+    werden nur die noch nicht bewerteten Texte an das Modell geschickt.
+    """
+    if "input_ids" in df.columns:
+        input_ids = parse_input_ids(df["input_ids"])
+    else:
+        input_ids = encode_texts(tokenizer, df["text"])
+    token_counts = np.array([len(ids) for ids in input_ids])
+
+    too_long = token_counts > MAX_MODEL_TOKENS
+    for row_name, token_count in zip(df.index[too_long], token_counts[too_long]):
+        print(f"\u26a0\ufe0f Übersprungen (zu lang): Zeile {row_name} mit {token_count} Tokens")
+
+    keep = np.flatnonzero(~too_long)
+    probs = np.zeros((len(keep), len(LABELS)), dtype=np.float32)
+    missing = np.arange(len(keep))
+
+    if cache is not None:
+        keys = cache.make_keys(df["text"].iloc[keep])
+        cached = cache.get_many(keys)
+        hit = np.array([key in cached for key in keys], dtype=bool)
+        if hit.any():
+            probs[hit] = [cached[key] for key in keys[hit]]
+        missing = np.flatnonzero(~hit)
+
+    start_time = time.perf_counter()
+    probs[missing] = predict_batched(
+        model, [input_ids[keep[i]] for i in missing], tokenizer.pad_token_id, device, batch_size
+    )
+    model_seconds = time.perf_counter() - start_time
+
+    if cache is not None:
+        cache.put_many(keys[missing], probs[missing])
+        cache.record_run(len(keep) - len(missing), len(missing), model_seconds)
+
+    df_scored = df.iloc[keep].drop(columns="input_ids", errors="ignore")
+    df_scored["sentiment"] = np.array(LABELS)[probs.argmax(axis=1)]
+    df_scored["confidence"] = probs.max(axis=1)
+    df_scored["token_count"] = token_counts[keep]
+    for j, label in enumerate(LABELS):
+        df_scored[f"{label.lower()}_prob"] = probs[:, j]
+    return df_scored
 
 def main():
     print("\U0001f504 Initialisiere Sentiment-Analyse mit BERT...")
@@ -35,8 +137,6 @@ def main():
     tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
     model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME).to(device)
 
-    sentiment_pipeline = pipeline("sentiment-analysis", model=model, tokenizer=tokenizer, device=0 if torch.cuda.is_available() else -1)
-
     print(f"\U0001f4c4 Lade Daten aus '{INPUT_FILE}'...")
     try:
         df = pd.read_csv(INPUT_FILE)
@@ -48,44 +148,18 @@ def main():
     df_filtered = df[df["text"].notna() & (df["text"].str.len() > 20)].copy()
     print(f"\u2705 {len(df_filtered)} gültige Texte zur Analyse.")
 
-    results = []
-
-    print("\U0001f680 Analysiere Texte...")
-    for _, row in tqdm(df_filtered.iterrows(), total=len(df_filtered)):
-        text = row["text"]
-
-        try:
-            tokens = tokenizer.encode(text, add_special_tokens=True, truncation=False)
-            token_count = len(tokens)
-            if token_count > 512:
-                print(f"\u26a0\ufe0f Übersprungen (zu lang): Zeile {row.name} mit {token_count} Tokens")
-                continue
-
-            result = sentiment_pipeline(text)[0]
-            sentiment = result["label"]
-            confidence = result["score"]
-
-            probs = {
-                "POSITIVE": confidence if sentiment == "POSITIVE" else 0.0,
-                "NEUTRAL": confidence if sentiment == "NEUTRAL" else 0.0,
-                "NEGATIVE": confidence if sentiment == "NEGATIVE" else 0.0,
-            }
-
-            results.append({
-                **row,
-                "sentiment": sentiment,
-                "confidence": confidence,
-                "token_count": token_count,
-                "positive_prob": probs["POSITIVE"],
-                "neutral_prob": probs["NEUTRAL"],
-                "negative_prob": probs["NEGATIVE"]
-            })
-
-        except Exception as e:
-            print(f"\u26a0\ufe0f Fehler bei Zeile {row.name}: {e}")
-
-    if results:
-        df_results = pd.DataFrame(results)
+    print(f"\U0001f680 Analysiere Texte (Batchgröße {BATCH_SIZE})...")
+    start_time = time.perf_counter()
+    cache = SentimentCache.for_model(CACHE_FILE, MODEL_NAME, model) if USE_CACHE else None
+    df_results = score_dataframe(df_filtered, tokenizer, model, device, BATCH_SIZE, cache)
+    elapsed = time.perf_counter() - start_time
+    if elapsed > 0:
+        print(f"\u23f1\ufe0f {len(df_results)} Chunks in {elapsed:.1f}s ({len(df_results) / elapsed:.1f} Chunks/s)")
+    if cache is not None:
+        print(cache.stats_line())
+        cache.close()
+
+    if not df_results.empty:
         df_results.to_csv(OUTPUT_FILE, index=False)
         print(f"\U0001f4c0 Ergebnisse gespeichert in '{OUTPUT_FILE}'")
 
@@ -114,10 +188,12 @@ def main():
             plt.savefig("sentiment_verteilung.png")
 
             if "speaker_party" in df_results.columns:
+                # Eine Stimme pro Rede statt pro (überlappendem) Chunk
+                speeches = aggregate_speeches(df_results) if "text_id" in df_results.columns else df_results
                 plt.figure(figsize=(12, 8))
                 party_sentiment = pd.crosstab(
-                    df_results["speaker_party"],
-                    df_results["sentiment"],
+                    speeches["speaker_party"],
+                    speeches["sentiment"],
                     normalize="index"
                 ) * 100
 
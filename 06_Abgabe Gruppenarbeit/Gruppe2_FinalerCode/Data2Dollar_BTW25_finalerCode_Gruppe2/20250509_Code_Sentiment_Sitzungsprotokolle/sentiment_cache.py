@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+sentiment_cache.py - Persistenter Ergebnis-Cache für die BERT-Sentimentanalyse
+
+Speichert die Wahrscheinlichkeiten je Chunk in einer lokalen SQLite-Datei. Der
+Schlüssel ist ein Hash aus Modellname, Modell-Revision und normalisiertem Text,
+sodass ein neues Modell oder eine neue Revision automatisch neu bewertet wird.
+
+Datum: 17.10.2026
+"""
+
+import hashlib
+import re
+import sqlite3
+
+import numpy as np
+
+SQLITE_MAX_VARIABLES = 900
+
+def normalize_text(text):
+    return re.sub(r'\s+', ' ', text).strip()
+
+class SentimentCache:
+    def __init__(self, path, model_name, revision):
+        self.path = path
+        self.prefix = f"{model_name}\x00{revision}\x00"
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS results ("
+            "key TEXT PRIMARY KEY, positive REAL, neutral REAL, negative REAL)"
+        )
+        self.conn.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value REAL)")
+        self.conn.commit()
+
+    @classmethod
+    def for_model(cls, path, model_name, model):
+        revision = getattr(model.config, "_commit_hash", None) or "unknown"
+        return cls(path, model_name, revision)
+
+    def make_keys(self, texts):
+        return np.array([
+            hashlib.sha256((self.prefix + normalize_text(text)).encode("utf-8")).hexdigest()
+            for text in texts
+        ])
+
+    def get_many(self, keys):
+        """Liefert {key: [positive, neutral, negative]} für alle gefundenen Schlüssel."""
+        found = {}
+        unique_keys = list(dict.fromkeys(keys))
+        for start in range(0, len(unique_keys), SQLITE_MAX_VARIABLES):
+            batch = unique_keys[start:start + SQLITE_MAX_VARIABLES]
+            placeholders = ",".join("?" * len(batch))
+            rows = self.conn.execute(
+                f"SELECT key, positive, neutral, negative FROM results WHERE key IN ({placeholders})", batch
+            )
+            for key, *probs in rows:
+                found[key] = probs
+        return found
+
+    def put_many(self, keys, probs):
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?)",
+            [(key, *map(float, row)) for key, row in zip(keys, probs)]
+        )
+        self.conn.commit()
+
+    def record_run(self, hits, misses, model_seconds):
+        """Merkt sich Treffer/Fehlschläge und die gemessene Modellzeit pro Chunk."""
+        self.hits += hits
+        self.misses += misses
+        if misses:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta VALUES ('seconds_per_chunk', ?)", (model_seconds / misses,)
+            )
+            self.conn.commit()
+
+    def seconds_per_chunk(self):
+        row = self.conn.execute("SELECT value FROM meta WHERE name = 'seconds_per_chunk'").fetchone()
+        return row[0] if row else None
+
+    def stats_line(self):
+        total = self.hits + self.misses
+        hit_rate = 100 * self.hits / total if total else 0.0
+        line = f"🗄️ Cache: {self.hits} Treffer, {self.misses} neu bewertet ({hit_rate:.1f}% Trefferquote)"
+        seconds_per_chunk = self.seconds_per_chunk()
+        if seconds_per_chunk is not None:
+            line += f", ca. {self.hits * seconds_per_chunk:.1f}s gespart"
+        return line
+
+    def close(self):
+        self.conn.close()
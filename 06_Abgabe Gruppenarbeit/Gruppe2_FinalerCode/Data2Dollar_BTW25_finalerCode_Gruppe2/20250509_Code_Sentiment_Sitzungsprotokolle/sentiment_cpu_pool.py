@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+sentiment_cpu_pool.py - Sentimentanalyse auf mehreren CPU-Prozessen
+
+Verteilt die Chunks aus 'bundestag_reden_tokenized_chunks.csv' auf NUM_WORKERS
+Prozesse. Jeder Prozess lädt 'oliverguhr/german-sentiment-bert' genau einmal,
+optional mit dynamischer int8-Quantisierung der Linear-Schichten, und nutzt
+THREADS_PER_WORKER Threads. Die Ergebnisse werden in chunk_id-Reihenfolge
+zusammengeführt und wie in sentiment_analysis_bert.py gespeichert.
+
+Datum: 17.10.2026
+"""
+
+import multiprocessing as mp
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from sentiment_analysis_bert import score_dataframe
+
+# Konfiguration
+MODEL_NAME = "oliverguhr/german-sentiment-bert"
+INPUT_FILE = "bundestag_reden_tokenized_chunks.csv"
+OUTPUT_FILE = "bundestagsreden_chunks_sentiment.csv"
+THREADS_PER_WORKER = 2
+NUM_WORKERS = max(1, (os.cpu_count() or 1) // THREADS_PER_WORKER)
+SHARDS_PER_WORKER = 4  # kleinere Shards gleichen unterschiedliche Laufzeiten aus
+QUANTIZE = True
+BATCH_SIZE = 32
+
+_worker_state = {}
+
+def load_cpu_model(quantize=QUANTIZE):
+    """Lädt das Modell für die CPU, optional mit dynamischer int8-Quantisierung."""
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME)
+    model.eval()
+    if quantize:
+        model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return model
+
+def init_worker(quantize, num_threads):
+    torch.set_num_threads(num_threads)
+    _worker_state["tokenizer"] = AutoTokenizer.from_pretrained(MODEL_NAME)
+    _worker_state["model"] = load_cpu_model(quantize)
+
+def score_shard(df_shard):
+    return score_dataframe(
+        df_shard, _worker_state["tokenizer"], _worker_state["model"], torch.device("cpu"), BATCH_SIZE
+    )
+
+def score_parallel(df, num_workers=NUM_WORKERS, quantize=QUANTIZE, num_threads=THREADS_PER_WORKER):
+    """Bewertet df in num_workers Prozessen und gibt die Ergebnisse nach chunk_id sortiert zurück."""
+    num_shards = min(len(df), num_workers * SHARDS_PER_WORKER)
+    shards = [df.iloc[idx] for idx in np.array_split(np.arange(len(df)), num_shards)]
+
+    ctx = mp.get_context("spawn")
+    with ctx.Pool(num_workers, initializer=init_worker, initargs=(quantize, num_threads)) as pool:
+        results = pool.map(score_shard, shards)
+
+    return pd.concat(results).sort_values("chunk_id", kind="stable")
+
+def main():
+    mode = "int8" if QUANTIZE else "fp32"
+    print(f"🔄 Initialisiere CPU-Sentiment-Analyse ({NUM_WORKERS} Prozesse x {THREADS_PER_WORKER} Threads, {mode})...")
+
+    print(f"📄 Lade Daten aus '{INPUT_FILE}'...")
+    try:
+        df = pd.read_csv(INPUT_FILE)
+        print(f"✅ {len(df)} Einträge gefunden.")
+    except Exception as e:
+        print(f"❌ Fehler beim Laden der Daten: {e}")
+        return
+
+    df_filtered = df[df["text"].notna() & (df["text"].str.len() > 20)]
+    print(f"✅ {len(df_filtered)} gültige Texte zur Analyse.")
+    if df_filtered.empty:
+        print("⚠️ Keine Ergebnisse zur Speicherung.")
+        return
+
+    start_time = time.perf_counter()
+    df_results = score_parallel(df_filtered)
+    elapsed = time.perf_counter() - start_time
+    print(f"⏱️ {len(df_results)} Chunks in {elapsed:.1f}s ({len(df_results) / elapsed:.1f} Chunks/s)")
+
+    df_results.to_csv(OUTPUT_FILE, index=False)
+    print(f"📀 Ergebnisse gespeichert in '{OUTPUT_FILE}'")
+    print("✅ Analyse abgeschlossen!")
+
+if __name__ == "__main__":
+    main()
@@ -15,7 +15,6 @@ import pandas as pd
 from transformers import AutoTokenizer
 import re
 import os
-from tqdm import tqdm
 
 # Konfiguration
 INPUT_FILE = "bundestag_reden_sentiment_30sitzungen.csv"
@@ -29,6 +28,88 @@ def clean_text(text):
         return ""
     return re.sub(r'\s+', ' ', text).strip()
 
+def count_original_tokens(df_chunks, num_special_tokens):
+    """
+    Rekonstruiert die Token-Anzahl der ungeteilten Texte aus den Chunks.
+
+    Jedes Fenster enthält eigene Sondertokens, aufeinanderfolgende Fenster
+    überlappen sich um OVERLAP Tokens.
+    """
+    per_text = df_chunks.groupby("text_id").agg(
+        tokens=("token_count", "sum"), windows=("total_chunks", "first")
+    )
+    content = per_text["tokens"] - num_special_tokens * per_text["windows"] - OVERLAP * (per_text["windows"] - 1)
+    return int((content + num_special_tokens).sum())
+
+def split_block(df_block, tokenizer, chunk_id=0):
+    """
+    Teilt alle Texte eines DataFrame-Blocks in Token-Blöcke auf.
+
+    Alle Texte werden in einem einzigen Aufruf des Fast-Tokenizers in
+    überlappende Fenster zerlegt (return_overflowing_tokens, stride=OVERLAP).
+    Der Chunk-Text wird über die Offsets aus dem Originaltext geschnitten und
+    die Token-IDs werden in der Spalte 'input_ids' mitgespeichert, damit die
+    Sentiment-Analyse nicht erneut tokenisieren muss.
+
+    Gibt die Liste der Chunks und die nächste freie chunk_id zurück, damit
+    mehrere Blöcke nacheinander fortlaufend nummeriert werden können.
+    """
+    if not tokenizer.is_fast:
+        raise ValueError("split_block benötigt einen Fast-Tokenizer (Offset-Mapping)")
+
+    texts = [clean_text(text) for text in df_block["text"]]
+    encoding = tokenizer(
+        texts,
+        add_special_tokens=True,
+        truncation=True,
+        max_length=MAX_TOKENS,
+        stride=OVERLAP,
+        return_overflowing_tokens=True,
+        return_offsets_mapping=True,
+        return_special_tokens_mask=True,
+    )
+    sample_mapping = encoding["overflow_to_sample_mapping"]
+
+    windows_per_text = [0] * len(texts)
+    for sample in sample_mapping:
+        windows_per_text[sample] += 1
+
+    meta_columns = [col for col in df_block.columns if col != "text"]
+    meta_rows = df_block[meta_columns].to_dict("records")
+    text_ids = [f"text_{idx}" for idx in df_block.index]
+
+    chunks = []
+    chunk_number = 0
+    previous_sample = None
+
+    for window, sample in enumerate(sample_mapping):
+        chunk_number = chunk_number + 1 if sample == previous_sample else 1
+        previous_sample = sample
+
+        input_ids = encoding["input_ids"][window]
+        offsets = [
+            offset for offset, special
+            in zip(encoding["offset_mapping"][window], encoding["special_tokens_mask"][window])
+            if not special
+        ]
+        text = texts[sample]
+        chunk_text = text[offsets[0][0]:offsets[-1][1]] if offsets else text
+
+        chunk_data = {
+            "chunk_id": chunk_id,
+            "text_id": text_ids[sample],
+            "chunk_number": chunk_number,
+            "total_chunks": windows_per_text[sample],
+            "text": chunk_text,
+            "token_count": len(input_ids),
+            "input_ids": " ".join(map(str, input_ids))
+        }
+        chunk_data.update(meta_rows[sample])
+        chunks.append(chunk_data)
+        chunk_id += 1
+
+    return chunks, chunk_id
+
 def main():
     print(f"📄 Lade Datei '{INPUT_FILE}'...")
     try:
@@ -44,66 +125,12 @@ def main():
     df_valid = df[df["text"].notna()].copy()
     print(f"✅ {len(df_valid)} gültige Texte gefunden")
 
-    chunks = []
-    chunk_id = 0
-
     print("🔄 Teile Texte in Token-Blöcke...")
-    for idx, row in tqdm(df_valid.iterrows(), total=len(df_valid)):
-        text = clean_text(row["text"])
-        text_id = f"text_{idx}"
-        tokens = tokenizer.encode(text, add_special_tokens=True)
-
-        if len(tokens) <= MAX_TOKENS:
-            chunk_data = {
-                "chunk_id": chunk_id,
-                "text_id": text_id,
-                "chunk_number": 1,
-                "total_chunks": 1,
-                "text": text,
-                "token_count": len(tokens)
-            }
-            for col in df.columns:
-                if col != "text":
-                    chunk_data[col] = row[col]
-            chunks.append(chunk_data)
-            chunk_id += 1
-        else:
-            chunk_parts = []
-            for i in range(0, len(tokens), MAX_TOKENS - OVERLAP):
-                end_idx = min(i + MAX_TOKENS, len(tokens))
-                chunk_tokens = tokens[i:end_idx]
-
-                chunk_text = tokenizer.convert_tokens_to_string(tokenizer.convert_ids_to_tokens(chunk_tokens))
-
-                chunk_parts.append({
-                    "tokens": chunk_tokens,
-                    "text": chunk_text,
-                    "token_count": len(chunk_tokens)
-                })
-
-                if end_idx == len(tokens):
-                    break
-
-            for i, part in enumerate(chunk_parts):
-                chunk_data = {
-                    "chunk_id": chunk_id,
-                    "text_id": text_id,
-                    "chunk_number": i + 1,
-                    "total_chunks": len(chunk_parts),
-                    "text": part["text"],
-                    "token_count": part["token_count"]
-                }
-                for col in df.columns:
-                    if col != "text":
-                        chunk_data[col] = row[col]
-                chunks.append(chunk_data)
-                chunk_id += 1
+    chunks, _ = split_block(df_valid, tokenizer)
 
     df_chunks = pd.DataFrame(chunks)
 
-    total_original_tokens = df_valid["text"].apply(
-        lambda x: len(tokenizer.encode(x, add_special_tokens=True))
-    ).sum()
+    total_original_tokens = count_original_tokens(df_chunks, tokenizer.num_special_tokens_to_add())
     total_chunked_tokens = df_chunks["token_count"].sum()
 
     print(f"\n📊 Statistik:")
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+stream_chunk_scoring.py - Blockweises, fortsetzbares Chunking und Scoring
+
+Liest 'bundestag_reden_sentiment_30sitzungen.csv' in Blöcken fester Größe,
+teilt jeden Block in Token-Chunks auf, bewertet diese mit BERT und hängt die
+Ergebnisse als Parquet-Datei an den Ordner OUTPUT_DIR an. Nach jedem Block wird
+ein Checkpoint mit der letzten abgeschlossenen chunk_id geschrieben, sodass ein
+abgebrochener Lauf beim nächsten Start dort weitermacht.
+
+Ergebnis einlesen: pd.read_parquet(OUTPUT_DIR)  (benötigt pyarrow)
+
+Datum: 17.10.2026
+"""
+
+import json
+import os
+import time
+
+import pandas as pd
+import torch
+from transformers import AutoTokenizer, AutoModelForSequenceClassification
+
+from split_texts_to_chunks import split_block
+from sentiment_analysis_bert import score_dataframe
+from sentiment_cache import SentimentCache
+
+# Konfiguration
+MODEL_NAME = "oliverguhr/german-sentiment-bert"
+INPUT_FILE = "bundestag_reden_sentiment_30sitzungen.csv"
+OUTPUT_DIR = "bundestagsreden_chunks_sentiment_parquet"
+CHECKPOINT_FILE = os.path.join(OUTPUT_DIR, "_checkpoint.json")
+BLOCK_SIZE = 200  # Reden pro Block
+BATCH_SIZE = 32
+USE_CACHE = True
+CACHE_FILE = "sentiment_cache.sqlite"
+
+def load_checkpoint():
+    if not os.path.exists(CHECKPOINT_FILE):
+        return {"rows_done": 0, "next_block": 0, "next_chunk_id": 0, "last_chunk_id": None}
+    with open(CHECKPOINT_FILE, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+def save_checkpoint(state):
+    tmp_file = CHECKPOINT_FILE + ".tmp"
+    with open(tmp_file, "w", encoding="utf-8") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_file, CHECKPOINT_FILE)
+
+def iter_blocks(path, block_size, rows_done=0):
+    """Liefert die Eingabe-CSV blockweise; bereits verarbeitete Zeilen werden übersprungen."""
+    reader = pd.read_csv(path, chunksize=block_size, skiprows=range(1, rows_done + 1))
+    offset = rows_done
+    for block in reader:
+        # Index fortlaufend halten, damit text_id über Neustarts hinweg stabil bleibt
+        block.index = range(offset, offset + len(block))
+        offset += len(block)
+        yield block
+
+def iter_scored_blocks(tokenizer, model, device, state, cache=None):
+    """Generator: chunkt und bewertet Block für Block und liefert (Block, Ergebnisse, nächste chunk_id)."""
+    for block in iter_blocks(INPUT_FILE, BLOCK_SIZE, state["rows_done"]):
+        df_valid = block[block["text"].notna()]
+        chunks, next_chunk_id = split_block(df_valid, tokenizer, state["next_chunk_id"])
+        df_chunks = pd.DataFrame(chunks)
+
+        if df_chunks.empty:
+            df_scored = df_chunks
+        else:
+            df_chunks = df_chunks[df_chunks["text"].str.len() > 20]
+            df_scored = score_dataframe(df_chunks, tokenizer, model, device, BATCH_SIZE, cache)
+
+        yield block, df_scored, next_chunk_id
+
+def write_part(df_scored, block_number):
+    part_file = os.path.join(OUTPUT_DIR, f"part-{block_number:05d}.parquet")
+    tmp_file = part_file + ".tmp"
+    df_scored.to_parquet(tmp_file, index=False)
+    os.replace(tmp_file, part_file)
+    return part_file
+
+def main():
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    state = load_checkpoint()
+    if state["rows_done"]:
+        print(f"🔁 Setze fort nach {state['rows_done']} Reden (letzte chunk_id: {state['last_chunk_id']})")
+
+    device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
+    print(f"🖥️ Verwende Gerät: {device}")
+
+    print(f"📦 Lade Modell '{MODEL_NAME}'...")
+    tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+    model = AutoModelForSequenceClassification.from_pretrained(MODEL_NAME).to(device)
+
+    print(f"🚀 Verarbeite '{INPUT_FILE}' in Blöcken à {BLOCK_SIZE} Reden...")
+    start_time = time.perf_counter()
+    scored_total = 0
+
+    cache = SentimentCache.for_model(CACHE_FILE, MODEL_NAME, model) if USE_CACHE else None
+
+    for block, df_scored, next_chunk_id in iter_scored_blocks(tokenizer, model, device, state, cache):
+        if not df_scored.empty:
+            part_file = write_part(df_scored, state["next_block"])
+            state["last_chunk_id"] = int(df_scored["chunk_id"].max())
+            print(f"📀 {len(df_scored)} Chunks gespeichert in '{part_file}'")
+
+        state["rows_done"] += len(block)
+        state["next_block"] += 1
+        state["next_chunk_id"] = next_chunk_id
+        save_checkpoint(state)
+        scored_total += len(df_scored)
+
+    elapsed = time.perf_counter() - start_time
+    print(f"\n📊 {scored_total} Chunks in {elapsed:.1f}s bewertet ({state['rows_done']} Reden insgesamt)")
+    if cache is not None:
+        print(cache.stats_line())
+        cache.close()
+    print(f"✅ Ergebnisse liegen in '{OUTPUT_DIR}' (pd.read_parquet)")
+
+if __name__ == "__main__":
+    main()
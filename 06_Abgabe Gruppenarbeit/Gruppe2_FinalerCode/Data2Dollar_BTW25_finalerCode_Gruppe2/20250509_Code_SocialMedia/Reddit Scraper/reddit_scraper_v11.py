@@ -4,7 +4,7 @@ import pandas as pd
 import concurrent.futures
 import os
 import json
-import pickle
+import sqlite3
 from datetime import datetime, timedelta
 import time
 from tqdm import tqdm
@@ -12,6 +12,8 @@ import logging
 import sys
 import re
 import argparse
+import queue
+import threading
 from praw.models import MoreComments
 
 # Set up logging
@@ -35,6 +37,13 @@ parser.add_argument('--comments', action='store_true', help='Scrape comments for
 parser.add_argument('--comment-limit', type=int, default=100, help='Maximum number of comments to scrape per post')
 parser.add_argument('--comment-sort', type=str, default='top', choices=['top', 'best', 'new', 'controversial', 'old', 'qa'], 
                     help='Comment sort method')
+parser.add_argument('--comment-workers', type=int, default=4, help='Number of parallel comment fetch workers')
+parser.add_argument('--comment-rpm', type=int, default=60,
+                    help='Shared request budget per minute for comment fetching (Reddit allows ~100 QPM per OAuth client)')
+parser.add_argument('--incremental', action='store_true',
+                    help='Only fetch submissions newer than the stored high-water marks and append them to the dataset')
+parser.add_argument('--start-date', type=str, help='Start of the time window (YYYY-MM-DD)')
+parser.add_argument('--end-date', type=str, help='End of the time window (YYYY-MM-DD, default: now in incremental mode)')
 args = parser.parse_args()
 
 if args.debug:
@@ -43,14 +52,18 @@ if args.debug:
 
 # Configuration
 SUBREDDIT = "de"
-START_DATE = datetime(2024, 11, 1)
-END_DATE = datetime(2025, 4, 1)
+INCREMENTAL = args.incremental
+START_DATE = datetime.strptime(args.start_date, '%Y-%m-%d') if args.start_date else datetime(2024, 11, 1)
+if args.end_date:
+    END_DATE = datetime.strptime(args.end_date, '%Y-%m-%d')
+else:
+    END_DATE = datetime.now() if INCREMENTAL else datetime(2025, 4, 1)
 START_TS = int(START_DATE.timestamp())
 END_TS = int(END_DATE.timestamp())
 MAX_POSTS_PER_KEYWORD = args.max_posts
-CACHE_DIR = "scraper_cache"
+CACHE_DB = "scraper_cache.sqlite"
 USE_CACHE = not args.no_cache
-COMMENTS_DIR = "comments_cache"
+TIME_FILTER = "year"  # can be hour, day, week, month, year, all
 
 # Reddit API credentials
 CLIENT_ID = "56pMmac9Mba5D1vtMP-AnQ"
@@ -88,9 +101,17 @@ ALLOWED_FLAIRS = {
 # Allow posts with no flair or None flair
 ALLOW_NO_FLAIR = True
 
-# Setup cache directories
-os.makedirs(CACHE_DIR, exist_ok=True)
-os.makedirs(COMMENTS_DIR, exist_ok=True)
+# Columns stored in the cache database (the keyword is stored per search result)
+POST_COLUMNS = [
+    "id", "title", "selftext", "created_utc", "created_date", "score", "num_comments",
+    "permalink", "url", "author", "flair", "upvote_ratio", "is_original_content",
+    "is_self", "scraped_time", "has_comments_file"
+]
+COMMENT_COLUMNS = [
+    "id", "post_id", "author", "body", "created_utc", "created_date", "score",
+    "is_submitter", "level", "permalink"
+]
+SQLITE_MAX_VARIABLES = 900
 
 def init_reddit():
     """Initialize Reddit API client"""
@@ -100,35 +121,170 @@ def init_reddit():
         user_agent=USER_AGENT
     )
 
-def get_cache_filename(keyword, method_name):
-    """Generate a cache filename for a keyword and method"""
-    safe_keyword = re.sub(r'[^\w]', '_', keyword)
-    return f"{CACHE_DIR}/{safe_keyword}_{method_name}_{START_DATE.strftime('%Y%m%d')}_{END_DATE.strftime('%Y%m%d')}.pkl"
+class CacheStore:
+    """Single-file SQLite cache (WAL mode) with posts, search results and comments keyed by id"""
+    def __init__(self, path):
+        self.path = path
+        self.local = threading.local()
+        self.write_lock = threading.Lock()
+        self._conn().executescript(f"""
+            CREATE TABLE IF NOT EXISTS posts ({", ".join(POST_COLUMNS)}, PRIMARY KEY (id));
+            CREATE TABLE IF NOT EXISTS searches (cache_key TEXT PRIMARY KEY, fetched_at TEXT);
+            CREATE TABLE IF NOT EXISTS search_results (
+                cache_key TEXT, post_id TEXT, keyword TEXT, position INTEGER,
+                PRIMARY KEY (cache_key, post_id)
+            );
+            CREATE TABLE IF NOT EXISTS comments ({", ".join(COMMENT_COLUMNS)}, PRIMARY KEY (id));
+            CREATE INDEX IF NOT EXISTS comments_post_id ON comments (post_id);
+            CREATE TABLE IF NOT EXISTS high_water_marks (
+                subreddit TEXT, cache_key TEXT, created_utc INTEGER, updated_at TEXT,
+                PRIMARY KEY (subreddit, cache_key)
+            );
+        """)
+
+    def _conn(self):
+        # sqlite3 connections must not be shared between threads
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=60)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+
+    def _upsert(self, conn, table, columns, rows):
+        placeholders = ", ".join("?" * len(columns))
+        updates = ", ".join(f"{col} = excluded.{col}" for col in columns if col != "id")
+        conn.executemany(
+            f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({placeholders}) "
+            f"ON CONFLICT(id) DO UPDATE SET {updates}",
+            ([row.get(col) for col in columns] for row in rows)
+        )
+
+    def _select_in(self, query, ids):
+        """Run a query containing '{ids}' for a list of ids in batches of bound parameters"""
+        conn = self._conn()
+        ids = list(dict.fromkeys(ids))
+        for start in range(0, len(ids), SQLITE_MAX_VARIABLES):
+            batch = ids[start:start + SQLITE_MAX_VARIABLES]
+            yield from conn.execute(query.format(ids=", ".join("?" * len(batch))), batch)
+
+    def save_search(self, cache_key, posts, append=False):
+        """Bulk upsert the posts of a search and remember which posts it returned"""
+        with self.write_lock:
+            conn = self._conn()
+            with conn:
+                self._upsert(conn, "posts", POST_COLUMNS, posts)
+                offset = 0
+                if append:
+                    offset = conn.execute(
+                        "SELECT COALESCE(MAX(position) + 1, 0) FROM search_results WHERE cache_key = ?", (cache_key,)
+                    ).fetchone()[0]
+                else:
+                    conn.execute("DELETE FROM search_results WHERE cache_key = ?", (cache_key,))
+                conn.executemany(
+                    "INSERT OR IGNORE INTO search_results VALUES (?, ?, ?, ?)",
+                    ((cache_key, post["id"], post["keyword"], offset + i) for i, post in enumerate(posts))
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO searches VALUES (?, ?)", (cache_key, datetime.now().isoformat())
+                )
+
+    def load_search(self, cache_key):
+        """Return the cached posts of a search or None if the search was never run"""
+        conn = self._conn()
+        if conn.execute("SELECT 1 FROM searches WHERE cache_key = ?", (cache_key,)).fetchone() is None:
+            return None
+        columns = ", ".join(f"p.{col}" for col in POST_COLUMNS)
+        cursor = conn.execute(
+            f"SELECT r.keyword, {columns} FROM search_results r JOIN posts p ON p.id = r.post_id "
+            f"WHERE r.cache_key = ? ORDER BY r.position",
+            (cache_key,)
+        )
+        return [dict(zip(["keyword"] + POST_COLUMNS, row)) for row in cursor]
+
+    def get_high_water(self, subreddit, cache_key):
+        """Newest created_utc seen so far for a subreddit and search, or None"""
+        row = self._conn().execute(
+            "SELECT created_utc FROM high_water_marks WHERE subreddit = ? AND cache_key = ?", (subreddit, cache_key)
+        ).fetchone()
+        return row[0] if row else None
+
+    def set_high_water(self, subreddit, cache_key, created_utc):
+        with self.write_lock:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT INTO high_water_marks VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT(subreddit, cache_key) DO UPDATE SET "
+                    "created_utc = MAX(created_utc, excluded.created_utc), updated_at = excluded.updated_at",
+                    (subreddit, cache_key, int(created_utc), datetime.now().isoformat())
+                )
+
+    def save_comments(self, post_id, comments):
+        with self.write_lock:
+            conn = self._conn()
+            with conn:
+                self._upsert(conn, "comments", COMMENT_COLUMNS, ({**c, "post_id": post_id} for c in comments))
+
+    def load_comments(self, post_ids):
+        """Bulk lookup: {post_id: [comment, ...]} for all posts with cached comments"""
+        columns = ", ".join(COMMENT_COLUMNS)
+        found = {}
+        for row in self._select_in(f"SELECT {columns} FROM comments WHERE post_id IN ({{ids}})", post_ids):
+            comment = dict(zip(COMMENT_COLUMNS, row))
+            found.setdefault(comment["post_id"], []).append(comment)
+        return found
 
-def get_comments_cache_filename(post_id):
-    """Generate a cache filename for comments of a post"""
-    return f"{COMMENTS_DIR}/comments_{post_id}.pkl"
+    def export_comments(self, post_ids, output_file, chunksize=50000):
+        """Stream all comments of the given posts straight from SQLite into a CSV file"""
+        conn = self._conn()
+        with conn:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS export_ids (id TEXT PRIMARY KEY)")
+            conn.execute("DELETE FROM export_ids")
+            conn.executemany("INSERT OR IGNORE INTO export_ids VALUES (?)", ((str(i),) for i in post_ids))
+        query = (f"SELECT {', '.join('c.' + col for col in COMMENT_COLUMNS)} FROM comments c "
+                 f"JOIN export_ids e ON e.id = c.post_id ORDER BY c.post_id")
+        total_comments = 0
+        for i, chunk in enumerate(pd.read_sql_query(query, conn, chunksize=chunksize)):
+            chunk.to_csv(output_file, mode='w' if i == 0 else 'a', header=(i == 0), index=False, encoding='utf-8')
+            total_comments += len(chunk)
+        post_count = conn.execute(
+            "SELECT COUNT(DISTINCT c.post_id) FROM comments c JOIN export_ids e ON e.id = c.post_id"
+        ).fetchone()[0]
+        return total_comments, post_count
+
+cache_store = CacheStore(CACHE_DB)
+
+def get_cache_key(keyword, method_name):
+    """Generate a cache key for a keyword and method (keyword None = shared listing)"""
+    safe_keyword = re.sub(r'[^\w]', '_', keyword) if keyword is not None else "_listing"
+    if INCREMENTAL:
+        # Incremental datasets grow over time, so the key must not depend on the date range
+        return f"{safe_keyword}_{method_name}_incremental"
+    return f"{safe_keyword}_{method_name}_{START_DATE.strftime('%Y%m%d')}_{END_DATE.strftime('%Y%m%d')}"
+
+def get_output_filename(kind):
+    """Output CSV name for 'posts' or 'comments'"""
+    if INCREMENTAL:
+        return f"r_{SUBREDDIT}_{kind}_incremental_v11.csv"
+    return f"r_{SUBREDDIT}_{kind}_{START_DATE.strftime('%Y%m%d')}_{END_DATE.strftime('%Y%m%d')}_v11.csv"
 
 def load_from_cache(keyword, method_name):
     """Load posts from cache if available and cache usage is enabled"""
     if not USE_CACHE:
         return None
-        
-    cache_file = get_cache_filename(keyword, method_name)
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'rb') as f:
-                return pickle.load(f)
-        except Exception as e:
-            logger.error(f"Error loading cache for {keyword}, {method_name}: {e}")
+    
+    try:
+        return cache_store.load_search(get_cache_key(keyword, method_name))
+    except Exception as e:
+        logger.error(f"Error loading cache for {keyword}, {method_name}: {e}")
     return None
 
-def save_to_cache(keyword, method_name, data):
+def save_to_cache(keyword, method_name, data, append=False):
     """Save posts to cache"""
-    cache_file = get_cache_filename(keyword, method_name)
     try:
-        with open(cache_file, 'wb') as f:
-            pickle.dump(data, f)
+        cache_store.save_search(get_cache_key(keyword, method_name), data, append=append)
     except Exception as e:
         logger.error(f"Error saving cache for {keyword}, {method_name}: {e}")
 
@@ -136,43 +292,17 @@ def load_comments_from_cache(post_id):
     """Load comments from cache if available"""
     if not USE_CACHE:
         return None
-        
-    cache_file = get_comments_cache_filename(post_id)
-    if os.path.exists(cache_file):
-        try:
-            with open(cache_file, 'rb') as f:
-                data = pickle.load(f)
-                logger.debug(f"Successfully loaded comments from {cache_file}")
-                return data
-        except Exception as e:
-            logger.error(f"Error loading comments cache for post {post_id}: {str(e)}")
-    else:
-        # Try alternative filenames that might exist
-        # This helps with compatibility with older versions or different cache approaches
-        alternative_patterns = [
-            f"{COMMENTS_DIR}/comments_{post_id}.pkl",
-            f"{COMMENTS_DIR}/{post_id}_comments.pkl",
-            f"{COMMENTS_DIR}/comment_{post_id}.pkl"
-        ]
-        
-        for alt_file in alternative_patterns:
-            if os.path.exists(alt_file):
-                try:
-                    with open(alt_file, 'rb') as f:
-                        data = pickle.load(f)
-                        logger.debug(f"Successfully loaded comments from alternative file {alt_file}")
-                        return data
-                except Exception as e:
-                    logger.error(f"Error loading alternative comments cache for post {post_id}: {str(e)}")
-                    
+    
+    try:
+        return cache_store.load_comments([post_id]).get(post_id)
+    except Exception as e:
+        logger.error(f"Error loading comments cache for post {post_id}: {str(e)}")
     return None
 
 def save_comments_to_cache(post_id, comments_data):
     """Save comments to cache"""
-    cache_file = get_comments_cache_filename(post_id)
     try:
-        with open(cache_file, 'wb') as f:
-            pickle.dump(comments_data, f)
+        cache_store.save_comments(post_id, comments_data)
     except Exception as e:
         logger.error(f"Error saving comments cache for post {post_id}: {e}")
 
@@ -198,7 +328,7 @@ def process_comment(comment, level=0):
         logger.error(f"Error processing comment {comment.id if hasattr(comment, 'id') else 'unknown'}: {str(e)}")
         return None
 
-def get_comments_for_post(reddit, post_id, limit=100, sort='top'):
+def get_comments_for_post(reddit, post_id, limit=100, sort='top', rate_limiter=None):
     """Get comments for a post"""
     # First check if we have cached comments
     cached_comments = load_comments_from_cache(post_id)
@@ -208,6 +338,9 @@ def get_comments_for_post(reddit, post_id, limit=100, sort='top'):
     
     comments_data = []
     try:
+        # One API request per post: the comment tree is loaded in a single call
+        if rate_limiter is not None:
+            rate_limiter.acquire()
         logger.info(f"Fetching comments for post {post_id}")
         submission = reddit.submission(id=post_id)
         submission.comment_sort = sort
@@ -237,9 +370,6 @@ def get_comments_for_post(reddit, post_id, limit=100, sort='top'):
                     reply_data = process_comment(reply, level=1)
                     if reply_data:
                         comments_data.append(reply_data)
-            
-            # Add small delay to avoid rate limiting
-            time.sleep(0.05)
         
         logger.info(f"Successfully processed {len(comments_data)} comments for post {post_id}")
     except Exception as e:
@@ -254,6 +384,97 @@ def get_comments_for_post(reddit, post_id, limit=100, sort='top'):
         
     return comments_data
 
+class TokenBucket:
+    """Thread-safe token bucket limiting the request rate of all comment workers"""
+    def __init__(self, rate_per_minute, capacity=None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or max(1, rate_per_minute // 10)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a request token is available"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+class CommentHarvester:
+    """Fetches comments in background workers so post discovery never waits on comment I/O"""
+    def __init__(self, num_workers, rate_limiter, limit=100, sort='top'):
+        self.queue = queue.Queue()
+        self.rate_limiter = rate_limiter
+        self.limit = limit
+        self.sort = sort
+        self.lock = threading.Lock()
+        self.submitted = set()
+        self.stats = {"queued": 0, "done": 0, "failed": 0, "comments": 0}
+        self.start_time = time.time()
+        self.workers = [
+            threading.Thread(target=self._worker, name=f"comments-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self.workers:
+            worker.start()
+
+    def submit(self, post_id):
+        """Queue a post for comment harvesting (non-blocking, each post only once)"""
+        with self.lock:
+            if post_id in self.submitted:
+                return
+            self.submitted.add(post_id)
+            self.stats["queued"] += 1
+        self.queue.put(post_id)
+
+    def _worker(self):
+        # PRAW instances are not thread-safe, so every worker gets its own client
+        reddit = init_reddit()
+        while True:
+            post_id = self.queue.get()
+            if post_id is None:
+                self.queue.task_done()
+                break
+            try:
+                comments = get_comments_for_post(
+                    reddit, post_id, limit=self.limit, sort=self.sort, rate_limiter=self.rate_limiter
+                )
+                with self.lock:
+                    self.stats["done"] += 1
+                    self.stats["comments"] += len(comments)
+            except Exception as e:
+                logger.error(f"Comment worker failed for post {post_id}: {str(e)}")
+                with self.lock:
+                    self.stats["failed"] += 1
+            finally:
+                self.queue.task_done()
+
+    def progress(self):
+        """Return a one-line progress and throughput summary"""
+        with self.lock:
+            stats = dict(self.stats)
+        elapsed = max(time.time() - self.start_time, 1e-9)
+        return (f"Comments: {stats['done']}/{stats['queued']} posts done, {stats['failed']} failed, "
+                f"{self.queue.qsize()} pending, {stats['comments']} comments "
+                f"({stats['done'] / elapsed * 60:.1f} posts/min)")
+
+    def close(self):
+        """Wait until the queue is drained and stop all workers"""
+        for _ in self.workers:
+            self.queue.put(None)
+        for worker in self.workers:
+            worker.join()
+        logger.info(self.progress())
+
+# Created in main() when --comments is set
+comment_harvester = None
+
 def process_submission(submission, keyword, include_comments=False):
     """Process a single submission"""
     try:
@@ -290,6 +511,41 @@ def process_submission(submission, keyword, include_comments=False):
         logger.error(f"Error processing submission {submission.id}: {str(e)}")
         return None
 
+class KeywordMatcher:
+    """Finds all keywords contained in a text in a single scan (case insensitive substring match)"""
+    def __init__(self, keywords):
+        self.keywords = list(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self.order = {keyword: i for i, keyword in enumerate(self.keywords)}
+        try:
+            import ahocorasick
+            self.automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self.automaton.add_word(keyword, keyword)
+            self.automaton.make_automaton()
+        except ImportError:
+            # Fallback: a zero-width lookahead visits every position once, then all
+            # keywords sharing the first character are checked at the matching positions
+            self.automaton = None
+            alternatives = sorted(self.keywords, key=len, reverse=True)
+            self.pattern = re.compile("(?=(?:" + "|".join(map(re.escape, alternatives)) + "))")
+            self.by_first_char = {}
+            for keyword in self.keywords:
+                self.by_first_char.setdefault(keyword[0], []).append(keyword)
+
+    def match(self, text):
+        """Return the matched keywords in KEYWORDS order"""
+        text = text.lower()
+        if self.automaton is not None:
+            found = {keyword for _, keyword in self.automaton.iter(text)}
+        else:
+            found = set()
+            for m in self.pattern.finditer(text):
+                start = m.start()
+                for keyword in self.by_first_char[text[start]]:
+                    if text.startswith(keyword, start):
+                        found.add(keyword)
+        return sorted(found, key=self.order.get)
+
 def check_flair(submission):
     """Check if submission flair is allowed"""
     # If we allow posts with no flair and this post has no flair, accept it
@@ -299,19 +555,66 @@ def check_flair(submission):
     # Otherwise check if the flair is in our allowed list
     return submission.link_flair_text in ALLOWED_FLAIRS
 
-def search_with_method(reddit, keyword, method_name, method_func, start_ts, end_ts):
-    """Search using a specific method with caching"""
+def search_with_method(reddit, keyword, method_name, method_func, start_ts, end_ts, time_ordered=False):
+    """Search using a specific method with caching
+    
+    time_ordered marks listings that return the newest submissions first. In
+    incremental mode these stop at the stored high-water mark, so only newer
+    submissions are fetched and appended to the existing dataset.
+    """
+    if INCREMENTAL:
+        return search_incremental(reddit, keyword, method_name, method_func, start_ts, end_ts, time_ordered)
+    
     # Try to load from cache if enabled
     cache_data = load_from_cache(keyword, method_name)
     if cache_data is not None:
         logger.info(f"Loaded {len(cache_data)} posts from cache for {method_name}_{keyword}")
+        if keyword is not None and comment_harvester is not None:
+            for post in cache_data:
+                if post["num_comments"] > 0:
+                    comment_harvester.submit(post["id"])
         return cache_data
     
+    logger.info(f"Performing fresh search with {method_name} for keyword '{keyword}'")
+    posts, _, _ = scan_submissions(keyword, method_name, method_func, start_ts, end_ts, time_ordered)
+    
+    # Save to cache
+    save_to_cache(keyword, method_name, posts)
+    
+    return posts
+
+def search_incremental(reddit, keyword, method_name, method_func, start_ts, end_ts, time_ordered):
+    """Fetch only submissions newer than the high-water mark and append them to the stored dataset"""
+    cache_key = get_cache_key(keyword, method_name)
+    high_water = cache_store.get_high_water(SUBREDDIT, cache_key) if time_ordered else None
+    if high_water is not None:
+        logger.info(f"Incremental {method_name} for '{keyword}': fetching posts newer than "
+                    f"{datetime.fromtimestamp(high_water)}")
+    
+    new_posts, newest_seen, completed = scan_submissions(
+        keyword, method_name, method_func, start_ts, end_ts, time_ordered, high_water
+    )
+    save_to_cache(keyword, method_name, new_posts, append=True)
+    
+    # Only advance the mark after a complete scan, otherwise a gap could be skipped forever
+    if time_ordered and completed and newest_seen is not None:
+        cache_store.set_high_water(SUBREDDIT, cache_key, newest_seen)
+    
+    logger.info(f"Appended {len(new_posts)} new posts for '{keyword}' using {method_name}")
+    return cache_store.load_search(cache_key) or []
+
+def scan_submissions(keyword, method_name, method_func, start_ts, end_ts, time_ordered=False, high_water=None):
+    """Iterate a listing and collect matching posts
+    
+    Returns (posts, newest created_utc seen inside the date window, completed without
+    error and without hitting MAX_POSTS_PER_KEYWORD).
+    """
     posts = []
     posts_checked = 0
     seen_ids = set()
-    
-    logger.info(f"Performing fresh search with {method_name} for keyword '{keyword}'")
+    newest_seen = None
+    capped = False
+    completed = False
     
     try:
         with tqdm(total=MAX_POSTS_PER_KEYWORD, desc=f"{method_name}_{keyword}") as pbar:
@@ -325,15 +628,22 @@ def search_with_method(reddit, keyword, method_name, method_func, start_ts, end_
                     continue
                 seen_ids.add(submission.id)
                 
+                created = int(submission.created_utc)
+                # Newest-first listings can stop at the high-water mark or the start of the window
+                if time_ordered and ((high_water is not None and created <= high_water) or created < start_ts):
+                    break
+                
                 # Debug: log every 100th post to see what's being checked
                 if args.debug and posts_checked % 100 == 0:
                     logger.debug(f"Checking post {posts_checked}: {submission.title[:50]}... (created: {datetime.fromtimestamp(submission.created_utc)})")
                 
-                created = int(submission.created_utc)
                 # Filter by date range
                 if start_ts <= created <= end_ts:
-                    # Check keyword match (case insensitive)
-                    if (keyword.lower() in submission.title.lower() or 
+                    # The mark may only cover posts inside the window that were actually looked at
+                    newest_seen = created if newest_seen is None else max(newest_seen, created)
+                    
+                    # Check keyword match (case insensitive); shared listings keep every post
+                    if (keyword is None or keyword.lower() in submission.title.lower() or 
                         (submission.selftext and keyword.lower() in submission.selftext.lower())):
                         
                         # Check if flair is allowed
@@ -342,15 +652,9 @@ def search_with_method(reddit, keyword, method_name, method_func, start_ts, end_
                             if processed:
                                 posts.append(processed)
                                 
-                                # If comments are requested, get them now
-                                if args.comments and submission.num_comments > 0:
-                                    # Get comments for this post
-                                    get_comments_for_post(
-                                        reddit, 
-                                        submission.id, 
-                                        limit=args.comment_limit,
-                                        sort=args.comment_sort
-                                    )
+                                # If comments are requested, hand the post to the comment workers
+                                if keyword is not None and comment_harvester is not None and submission.num_comments > 0:
+                                    comment_harvester.submit(submission.id)
                                 
                                 if len(posts) % 10 == 0:
                                     logger.info(f"Found {len(posts)} matching posts for '{keyword}' with {method_name}")
@@ -360,16 +664,18 @@ def search_with_method(reddit, keyword, method_name, method_func, start_ts, end_
                 time.sleep(sleep_time)
                 
                 if posts_checked >= MAX_POSTS_PER_KEYWORD:
+                    # The listing was cut off, so the scan is not complete and the mark must stay
+                    if high_water is not None:
+                        logger.warning(f"Reached --max-posts before the high-water mark for '{keyword}' "
+                                       f"using {method_name}; mark not advanced, rerun with a larger --max-posts")
+                    capped = True
                     break
+        completed = not capped
     except Exception as e:
         logger.error(f"Error in {method_name} for '{keyword}': {str(e)}")
     
     logger.info(f"Checked {posts_checked} posts for '{keyword}' using {method_name}, found {len(posts)}")
-    
-    # Save to cache
-    save_to_cache(keyword, method_name, posts)
-    
-    return posts
+    return posts, newest_seen, completed
 
 def process_keyword(keyword):
     """Process a single keyword with multiple search methods using time-based filtering"""
@@ -382,25 +688,19 @@ def process_keyword(keyword):
     timestamp_filter = f"timestamp:{START_TS}..{END_TS}"
     
     # For older Reddit API versions that might not support timestamp - use alternative method
-    time_period = "year"  # can be hour, day, week, month, year, all
+    time_period = TIME_FILTER
+    
+    # Incremental runs need newest-first results to stop at the high-water mark
+    search_sort = 'new' if INCREMENTAL else 'relevance'
     
-    # Define search methods with time range filtering
+    # Define keyword-specific search methods with time range filtering
+    # (top/hot/new do not depend on the keyword and are fetched once in fetch_shared_listings)
     search_methods = [
         ('search', lambda: subreddit.search(
             f'{keyword}',  # Simplified query to catch more results
-            sort='relevance',
+            sort=search_sort,
             time_filter=time_period,
             limit=MAX_POSTS_PER_KEYWORD
-        )),
-        ('top', lambda: subreddit.top(
-            time_filter=time_period,
-            limit=MAX_POSTS_PER_KEYWORD
-        )),
-        ('hot', lambda: subreddit.hot(
-            limit=MAX_POSTS_PER_KEYWORD
-        )),
-        ('new', lambda: subreddit.new(
-            limit=MAX_POSTS_PER_KEYWORD
         ))
     ]
     
@@ -413,7 +713,7 @@ def process_keyword(keyword):
         def make_search_func(query=flair_query):
             return lambda: subreddit.search(
                 query,
-                sort='relevance',
+                sort=search_sort,
                 time_filter=time_period,
                 limit=MAX_POSTS_PER_KEYWORD
             )
@@ -426,7 +726,7 @@ def process_keyword(keyword):
     # Execute all search methods
     for method_name, method_func in search_methods:
         posts = search_with_method(
-            reddit, keyword, method_name, method_func, START_TS, END_TS
+            reddit, keyword, method_name, method_func, START_TS, END_TS, time_ordered=INCREMENTAL
         )
         all_keyword_posts.extend(posts)
     
@@ -441,57 +741,91 @@ def process_keyword(keyword):
     logger.info(f"Found {len(unique_posts)} unique posts for keyword '{keyword}'")
     return unique_posts
 
+def fetch_shared_listings():
+    """Fetch the keyword-independent listings (top/hot/new) once per run into a shared store"""
+    reddit = init_reddit()
+    subreddit = reddit.subreddit(SUBREDDIT)
+    
+    listing_methods = [
+        ('top', lambda: subreddit.top(
+            time_filter=TIME_FILTER,
+            limit=MAX_POSTS_PER_KEYWORD
+        )),
+        ('hot', lambda: subreddit.hot(
+            limit=MAX_POSTS_PER_KEYWORD
+        )),
+        ('new', lambda: subreddit.new(
+            limit=MAX_POSTS_PER_KEYWORD
+        ))
+    ]
+    time_ordered_listings = {'new'}
+    if INCREMENTAL:
+        # top/hot are not chronological and cannot be cut at a high-water mark
+        listing_methods = [m for m in listing_methods if m[0] in time_ordered_listings]
+    
+    # In-memory store keyed by submission id; each listing is also cached on disk
+    store = {}
+    for method_name, method_func in listing_methods:
+        time_ordered = method_name in time_ordered_listings
+        for post in search_with_method(reddit, None, method_name, method_func, START_TS, END_TS, time_ordered):
+            store.setdefault(post['id'], post)
+    
+    logger.info(f"Shared listing store holds {len(store)} unique submissions")
+    return store
+
+def match_keywords_in_store(store, keywords):
+    """Match all keywords against the shared store in a single pass over title and selftext"""
+    matcher = KeywordMatcher(keywords)
+    matched = []
+    for post in store.values():
+        text = f"{post['title']}\n{post['selftext'] or ''}"
+        post_keywords = matcher.match(text)
+        for keyword in post_keywords:
+            matched.append({**post, "keyword": keyword})
+        if post_keywords and comment_harvester is not None and post['num_comments'] > 0:
+            comment_harvester.submit(post['id'])
+    
+    logger.info(f"Matched {len(matched)} keyword hits in the shared listing store")
+    return matched
+
 def save_comments_to_csv(posts_df):
     """Save all comments for the posts to a separate CSV file"""
     if not args.comments:
         return
-        
-    all_comments = []
-    post_ids_with_comments = 0
-    total_comments = 0
     
     logger.info(f"Preparing to export comments for {len(posts_df)} posts")
     
-    # List all comment cache files to see what we actually have
-    comment_cache_files = os.listdir(COMMENTS_DIR) if os.path.exists(COMMENTS_DIR) else []
-    logger.info(f"Found {len(comment_cache_files)} comment cache files in {COMMENTS_DIR}")
-    
-    with tqdm(total=len(posts_df), desc="Exporting comments") as pbar:
-        for post_id in posts_df['id']:
-            comments = load_comments_from_cache(post_id)
-            if comments:
-                for comment in comments:
-                    comment['post_id'] = post_id
-                    all_comments.append(comment)
-                post_ids_with_comments += 1
-                total_comments += len(comments)
-                logger.info(f"Loaded {len(comments)} comments for post {post_id}")
-            else:
-                logger.warning(f"No comments found in cache for post {post_id}")
-            pbar.update(1)
-    
-    if all_comments:
-        comments_df = pd.DataFrame(all_comments)
-        output_file = f"r_de_comments_{START_DATE.strftime('%Y%m%d')}_{END_DATE.strftime('%Y%m%d')}_v11.csv"
-        comments_df.to_csv(output_file, index=False, encoding='utf-8')
+    output_file = get_output_filename("comments")
+    total_comments, post_ids_with_comments = cache_store.export_comments(posts_df['id'], output_file)
+    
+    if total_comments:
         logger.info(f"Successfully saved {total_comments} comments from {post_ids_with_comments} posts to {output_file}")
     else:
         logger.warning("No comments were found.")
 
 def main():
+    global comment_harvester
     start_time = time.time()
     logger.info(f"Starting search for posts between {START_DATE.date()} and {END_DATE.date()}")
     logger.info(f"Using timestamps: {START_TS} to {END_TS}")
     logger.info(f"Cache usage is {'DISABLED' if not USE_CACHE else 'ENABLED'}")
+    logger.info(f"Incremental mode: {'ENABLED' if INCREMENTAL else 'DISABLED'}")
     logger.info(f"Maximum posts to check per keyword: {MAX_POSTS_PER_KEYWORD}")
     logger.info(f"Allow posts with no flair: {ALLOW_NO_FLAIR}")
     logger.info(f"Comments scraping: {'ENABLED' if args.comments else 'DISABLED'}")
     if args.comments:
         logger.info(f"  Comment limit per post: {args.comment_limit}")
         logger.info(f"  Comment sort method: {args.comment_sort}")
+        logger.info(f"  Comment workers: {args.comment_workers}, budget: {args.comment_rpm} requests/min")
+        comment_harvester = CommentHarvester(
+            args.comment_workers,
+            TokenBucket(args.comment_rpm),
+            limit=args.comment_limit,
+            sort=args.comment_sort
+        )
     
-    # Use parallel processing for keywords
-    all_posts = []
+    # Keyword-independent listings are fetched and matched once for all keywords
+    all_posts = match_keywords_in_store(fetch_shared_listings(), KEYWORDS)
     
     # Use ThreadPoolExecutor for concurrent processing
     max_workers = min(3, len(KEYWORDS))  # Reduced workers to avoid rate limiting
@@ -511,6 +845,8 @@ def main():
                 posts = future.result()
                 all_posts.extend(posts)
                 logger.info(f"Completed processing for '{keyword}', found {len(posts)} posts")
+                if comment_harvester is not None:
+                    logger.info(comment_harvester.progress())
             except Exception as e:
                 logger.error(f"Error processing '{keyword}': {str(e)}")
     
@@ -524,10 +860,15 @@ def main():
     
     logger.info(f"Total unique posts found across all keywords: {len(unique_posts)}")
     
+    # Post discovery is done, wait for the remaining comment fetches
+    if comment_harvester is not None:
+        logger.info(f"Waiting for comment workers to finish: {comment_harvester.progress()}")
+        comment_harvester.close()
+    
     # Save to CSV if we got any posts
     if unique_posts:
         df = pd.DataFrame(unique_posts)
-        output_file = f"r_de_posts_{START_DATE.strftime('%Y%m%d')}_{END_DATE.strftime('%Y%m%d')}_v11.csv"
+        output_file = get_output_filename("posts")
         df.to_csv(output_file, index=False, encoding='utf-8')
         logger.info(f"Successfully saved {len(df)} posts to {output_file}")
         
@@ -1,7 +1,10 @@
-import requests
-import os
+import sys
 from pathlib import Path
 
+# Shared pooled downloader lives one directory up
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from html_downloader import download
+
 def download_html_files():
     """
     Download HTML files from the Bundeswahlleiterin website for specific states
@@ -27,25 +30,9 @@ def download_html_files():
         "Thueringen": "https://www.bundeswahlleiterin.de/bundestagswahlen/2025/strukturdaten/bund-99/land-16.html"
     }
     
-    # Create output directory
-    output_dir = Path("downloaded_html")
-    output_dir.mkdir(exist_ok=True)
-    
-    for state_name, url in urls.items():
-        try:
-            # Download the HTML content
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Save the HTML content to a file
-            output_file = output_dir / f"{state_name}.html"
-            with open(output_file, "wb") as f:
-                f.write(response.content)
-            
-            print(f"Successfully downloaded {state_name} data to {output_file}")
-            
-        except requests.RequestException as e:
-            print(f"Error downloading {state_name}: {e}")
+    # Download all states concurrently; unchanged pages are skipped
+    targets = [(url, f"{state_name}.html") for state_name, url in urls.items()]
+    return download(targets, Path("downloaded_html"))
 
 if __name__ == "__main__":
     download_html_files()
\ No newline at end of file
@@ -3,10 +3,10 @@ import pandas as pd
 def add_percentage_symbol():
     """
     Add a percentage sign (%) at the end of column headers for columns containing percentage values
-    in the baden_wuerttemberg_wahlkreise_strukturdaten.csv file.
+    in the wahlkreise_strukturdaten.csv file.
     """
     # Load the CSV file
-    df = pd.read_csv("baden_wuerttemberg_wahlkreise_strukturdaten.csv")
+    df = pd.read_csv("wahlkreise_strukturdaten.csv")
     
     # List of columns that should be marked as percentages
     percentage_columns = [
@@ -48,7 +48,7 @@ def add_percentage_symbol():
     df = df.rename(columns=rename_dict)
     
     # Save the updated CSV
-    df.to_csv("baden_wuerttemberg_wahlkreise_strukturdaten.csv", index=False)
+    df.to_csv("wahlkreise_strukturdaten.csv", index=False)
     
     print("Percentage sign (%) added to percentage column headers.")
 
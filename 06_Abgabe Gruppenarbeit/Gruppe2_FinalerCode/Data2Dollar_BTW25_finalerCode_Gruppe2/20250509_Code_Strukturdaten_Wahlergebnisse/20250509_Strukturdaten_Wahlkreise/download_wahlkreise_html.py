@@ -1,79 +1,123 @@
-import requests
-import os
+import argparse
+import csv
+import re
+import sys
 from pathlib import Path
+from urllib.parse import urljoin
 
-def download_html_files():
+from lxml import html
+
+# Shared pooled downloader lives one directory up
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from html_downloader import download, fetch_texts
+
+# Federal index page; it links the state pages (land-N), which link their Wahlkreise (land-N/wahlkreis-M)
+BASE_URL = "https://www.bundeswahlleiterin.de/bundestagswahlen/2025/strukturdaten/bund-99.html"
+OUTPUT_DIR = Path("downloaded_wahlkreise_html")
+# Written next to the HTML files: maps every file to its Bundesland and Wahlkreis
+INDEX_FILE = "wahlkreise_index.csv"
+INDEX_COLUMNS = ["Land Nummer", "Bundesland", "Wahlkreis Nummer", "Wahlkreis Name", "URL", "Datei"]
+
+LAND_LINK = re.compile(r"/bund-99/land-(\d+)\.html$")
+WAHLKREIS_LINK = re.compile(r"/bund-99/land-(\d+)/wahlkreis-(\d+)\.html$")
+
+
+def discover_laender():
+    """Read the state pages (land-N) linked from the federal index page"""
+    page = fetch_texts([BASE_URL])[BASE_URL]
+    if page is None:
+        raise RuntimeError(f"Could not load index page {BASE_URL}")
+    
+    laender = {}
+    # The state menu links carry the plain state name as text
+    for link in html.fromstring(page).xpath("//a[@role='menuitem'][@href]"):
+        url = urljoin(BASE_URL, link.get("href"))
+        match = LAND_LINK.search(url)
+        if match and url.startswith(BASE_URL.rsplit("/", 1)[0]):
+            laender.setdefault(match.group(1), (link.text_content().strip(), url))
+    return laender
+
+
+def discover_wahlkreise(laender):
+    """Enumerate every wahlkreis-N link on the given state pages (fetched concurrently)"""
+    pages = fetch_texts([url for _, url in laender.values()])
+    
+    wahlkreise = {}
+    for land_id, (land_name, land_url) in laender.items():
+        page = pages.get(land_url)
+        if page is None:
+            continue
+        for link in html.fromstring(page).xpath("//a[@href]"):
+            url = urljoin(land_url, link.get("href"))
+            match = WAHLKREIS_LINK.search(url)
+            if not match or match.group(1) != land_id:
+                continue
+            # Link text looks like "258: Stuttgart I"
+            wk_number = match.group(2)
+            wk_name = link.text_content().strip().split(":", 1)[-1].strip()
+            wahlkreise[(land_id, wk_number)] = {
+                "Land Nummer": land_id,
+                "Bundesland": land_name,
+                "Wahlkreis Nummer": wk_number,
+                "Wahlkreis Name": wk_name,
+                "URL": url,
+            }
+    return sorted(wahlkreise.values(), key=lambda wk: int(wk["Wahlkreis Nummer"]))
+
+
+def load_index():
+    """Existing Wahlkreis index (Wahlkreis number -> record), empty if there is none yet"""
+    index_path = OUTPUT_DIR / INDEX_FILE
+    if not index_path.exists():
+        return {}
+    with open(index_path, 'r', newline='', encoding='utf-8') as f:
+        return {row["Wahlkreis Nummer"]: row for row in csv.DictReader(f)}
+
+
+def file_name(wk_number, wk_name):
+    # Using the number first keeps the order
+    clean_name = wk_name.replace(' ', '_').replace('-', '_').replace('–', '_').replace('/', '_')
+    return f"{wk_number}_{clean_name}.html"
+
+
+def download_html_files(land_ids=None):
     """
-    Download HTML files from the Bundeswahlleiterin website for Baden-Württemberg Wahlkreise
-    and save them to a local directory.
+    Discover all Wahlkreise (or those of the given states) from the index pages of the
+    Bundeswahlleiterin website, download them concurrently and write the Wahlkreis index.
     """
-    # Dictionary of Wahlkreise in Baden-Württemberg with their numbers and names
-    baden_wuerttemberg_wahlkreise = {
-        "258": "Stuttgart 1",
-        "259": "Stuttgart 2",
-        "260": "Böblingen",
-        "261": "Esslingen",
-        "262": "Nürtingen", 
-        "263": "Göppingen",
-        "264": "Waiblingen", 
-        "265": "Ludwigsburg",
-        "266": "Neckar-Zaber", 
-        "267": "Heilbronn", 
-        "268": "Schwäbisch Hall - Hohenlohe",
-        "269": "Backnang - Schwäbisch Gmünd", 
-        "270": "Aalen - Heidenheim", 
-        "271": "Karlsruhe-Stadt", 
-        "272": "Karlsruhe-Land", 
-        "273": "Rastatt", 
-        "274": "Heidelberg", 
-        "275": "Mannheim", 
-        "276": "Odenwald - Tauber", 
-        "277": "Rhein-Neckar", 
-        "278": "Bruchsal - Schwetzingen", 
-        "279": "Pforzheim", 
-        "280": "Calw", 
-        "281": "Freiburg", 
-        "282": "Lörrach - Müllheim", 
-        "283": "Emmendingen - Lahr", 
-        "284": "Offenburg", 
-        "285": "Rottweil - Tuttlingen", 
-        "286": "Schwarzwald-Baar", 
-        "287": "Konstanz", 
-        "288": "Waldshut", 
-        "289": "Reutlingen", 
-        "290": "Tübingen", 
-        "291": "Ulm", 
-        "292": "Biberach", 
-        "293": "Bodensee", 
-        "294": "Ravensburg", 
-        "295": "Zollernalb - Sigmaringen"
-    }
+    laender = discover_laender()
+    if land_ids:
+        laender = {land_id: land for land_id, land in laender.items() if land_id in land_ids}
+    print(f"Found {len(laender)} Bundesländer")
     
-    # Create output directory
-    output_dir = Path("downloaded_wahlkreise_html")
-    output_dir.mkdir(exist_ok=True)
+    wahlkreise = discover_wahlkreise(laender)
+    print(f"Found {len(wahlkreise)} Wahlkreise")
     
-    # URL template for Wahlkreise in Baden-Württemberg (land-8)
-    url_template = "https://www.bundeswahlleiterin.de/bundestagswahlen/2025/strukturdaten/bund-99/land-8/wahlkreis-{}.html"
+    index = load_index()
+    for wk in wahlkreise:
+        # Pages downloaded earlier keep their file name (e.g. 258_Stuttgart_1.html) and are updated in place
+        known = index.get(wk["Wahlkreis Nummer"])
+        if known and (OUTPUT_DIR / known["Datei"]).exists():
+            wk["Datei"] = known["Datei"]
+        else:
+            wk["Datei"] = file_name(wk["Wahlkreis Nummer"], wk["Wahlkreis Name"])
+    results = download([(wk["URL"], wk["Datei"]) for wk in wahlkreise], OUTPUT_DIR)
     
-    for wk_number, wk_name in baden_wuerttemberg_wahlkreise.items():
-        try:
-            # Construct the URL for this Wahlkreis
-            url = url_template.format(wk_number)
-            
-            # Download the HTML content
-            response = requests.get(url)
-            response.raise_for_status()  # Raise an exception for HTTP errors
-            
-            # Save the HTML content to a file (using number to keep order)
-            output_file = output_dir / f"{wk_number}_{wk_name.replace(' ', '_').replace('-', '_')}.html"
-            with open(output_file, "wb") as f:
-                f.write(response.content)
-            
-            print(f"Successfully downloaded Wahlkreis {wk_number} ({wk_name}) data to {output_file}")
-            
-        except requests.RequestException as e:
-            print(f"Error downloading Wahlkreis {wk_number} ({wk_name}): {e}")
+    # Merge into the index, so a run for some states (--land) keeps the entries of all other states
+    for wk in wahlkreise:
+        if results.get(wk["URL"]) != "failed":
+            index[wk["Wahlkreis Nummer"]] = wk
+    OUTPUT_DIR.mkdir(exist_ok=True)
+    with open(OUTPUT_DIR / INDEX_FILE, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=INDEX_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        writer.writerows(sorted(index.values(), key=lambda wk: int(wk["Wahlkreis Nummer"])))
+    print(f"Wahlkreis index written to {OUTPUT_DIR / INDEX_FILE} ({len(index)} Wahlkreise)")
+    return wahlkreise
+
 
 if __name__ == "__main__":
-    download_html_files()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Download the Strukturdaten pages of all Wahlkreise")
+    parser.add_argument("--land", nargs="*", help="Only these Bundesland IDs (land-N), e.g. --land 8 for Baden-Württemberg")
+    args = parser.parse_args()
+    download_html_files(args.land)
\ No newline at end of file
@@ -14,6 +14,12 @@ def rename_age_columns():
     # Load the CSV file
     df = pd.read_csv("bundesland_strukturdaten.csv")
     
+    # The table-driven scraper already writes the correct age columns; only files from the
+    # old positional scraper (shifted by one row) still need the renaming
+    if "Alter unter 16" not in df.columns:
+        print("Age columns are already correct, nothing to rename.")
+        return
+    
     # Define the column renaming mapping
     columns_to_rename = {
         "Alter unter 16": "Alter unter 18",
@@ -2,7 +2,7 @@ import pandas as pd
 
 def rename_wahlkreise_age_columns():
     """
-    Rename the age columns in baden_wuerttemberg_wahlkreise_strukturdaten.csv according to requirements:
+    Rename the age columns in wahlkreise_strukturdaten.csv according to requirements:
     - "Alter unter 16" -> "Alter unter 18"
     - "Alter 16-17" -> "Alter 18-24"
     - "Alter 18-24" -> "Alter 25-34"
@@ -12,7 +12,13 @@ def rename_wahlkreise_age_columns():
     - Delete "Alter über 75" column
     """
     # Load the CSV file
-    df = pd.read_csv("baden_wuerttemberg_wahlkreise_strukturdaten.csv")
+    df = pd.read_csv("wahlkreise_strukturdaten.csv")
+    
+    # The table-driven scraper already writes the correct age columns; only files from the
+    # old positional scraper (shifted by one row) still need the renaming
+    if "Alter unter 16" not in df.columns:
+        print("Age columns are already correct, nothing to rename.")
+        return
     
     # Define the column renaming mapping
     columns_to_rename = {
@@ -31,7 +37,7 @@ def rename_wahlkreise_age_columns():
     df = df.drop(columns=["Alter über 75"], errors="ignore")
     
     # Save the updated CSV
-    df.to_csv("baden_wuerttemberg_wahlkreise_strukturdaten.csv", index=False)
+    df.to_csv("wahlkreise_strukturdaten.csv", index=False)
     
     print("Age columns have been renamed and the 'Alter über 75' column has been deleted in the Wahlkreise CSV file.")
 
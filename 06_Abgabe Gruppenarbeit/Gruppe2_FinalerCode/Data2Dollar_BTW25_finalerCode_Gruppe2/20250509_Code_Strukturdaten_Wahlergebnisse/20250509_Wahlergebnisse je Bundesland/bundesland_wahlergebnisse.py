@@ -1,7 +1,11 @@
 import scrapy
+import argparse
 import os
 import csv
+import time
+from functools import lru_cache
 from bs4 import BeautifulSoup
+from lxml import etree, html
 
 
 class BundeslandWahlergebnisseSpider(scrapy.Spider):
@@ -19,6 +23,7 @@ PARTY_MAPPINGS = {
     'CDU': 'CDU/CSU',
     'CSU': 'CDU/CSU',
     'Christlich Demokratische Union Deutschlands': 'CDU/CSU',
+    'Christlich-Soziale Union in Bayern e.V.': 'CDU/CSU',
     
     # SPD variations
     'SPD': 'SPD',
@@ -55,127 +60,146 @@ PARTY_MAPPINGS = {
 # List of parties we want to collect data for
 TARGET_PARTIES = ['CDU/CSU', 'SPD', 'Grüne', 'AfD', 'Die Linke', 'BSW', 'FDP']
 
-def normalize_party_name(name):
-    """Normalize party names using the mapping dictionary"""
-    for key, value in PARTY_MAPPINGS.items():
-        if key.lower() in name.lower():
+# Results table of a page: the second tbody holds one row per party
+RESULT_TABLE = etree.XPath("(//*[starts-with(@id, 'stimmentabelle')])[1]")
+TABLE_BODIES = etree.XPath(".//tbody")
+ROW_CELLS = etree.XPath("th | td")
+ABBR_TITLE = etree.XPath("string(.//abbr/@title)")
+PAGE_TITLE = etree.XPath("string(//title)")
+
+def repair_encoding(text):
+    """Undo UTF-8 text that was decoded as Latin-1 (e.g. 'fÃ¼r' -> 'für')"""
+    if 'Ã' not in text and 'Â' not in text and 'â' not in text:
+        return text
+    try:
+        return text.encode('latin-1').decode('utf-8')
+    except UnicodeError:
+        return text
+
+# Exact lookup, built once: repaired and casefolded variant -> party
+PARTY_LOOKUP = {}
+for key, value in PARTY_MAPPINGS.items():
+    PARTY_LOOKUP.setdefault(repair_encoding(key).casefold(), value)
+
+@lru_cache(maxsize=None)
+def normalize_party_name(name, short_name=''):
+    """Normalize party names using the mapping dictionary.
+
+    The full name (abbr title) and the short name are looked up exactly first; only names
+    that are not in the mapping fall back to the substring scan. Results are cached per name.
+    """
+    name = repair_encoding(name)
+    for candidate in (name, repair_encoding(short_name)):
+        party = PARTY_LOOKUP.get(candidate.casefold())
+        if party:
+            return party
+    folded = name.casefold()
+    for key, value in PARTY_LOOKUP.items():
+        if key in folded:
             return value
     return name
 
-def extract_party_data(html_path):
+def cell_values(cells):
+    """Erst-/Zweitstimmen (total, percent) from the text of one results row"""
+    def clean(text, separator, replacement):
+        return text.replace(separator, replacement) if text != '-' else ''
+    return {
+        'Erststimmen_total': clean(cells[1], '.', ''),
+        'Erststimmen_percent': clean(cells[2], ',', '.'),
+        'Zweitstimmen_total': clean(cells[4], '.', ''),
+        'Zweitstimmen_percent': clean(cells[5], ',', '.'),
+    }
+
+def read_rows_lxml(content):
+    """Page title and party rows (name, short name, cell texts) via lxml"""
+    tree = html.fromstring(content)
+    tables = RESULT_TABLE(tree)
+    if not tables:
+        return PAGE_TITLE(tree), None
+    tbody_elements = TABLE_BODIES(tables[0])
+    if len(tbody_elements) < 2:
+        return PAGE_TITLE(tree), []
+    rows = []
+    for row in tbody_elements[1].iterchildren('tr'):
+        cells = [cell.text_content().strip() for cell in ROW_CELLS(row)]
+        if len(cells) < 6:
+            continue
+        rows.append((str(ABBR_TITLE(row)) or cells[0], cells[0], cells))
+    return PAGE_TITLE(tree), rows
+
+def read_rows_bs4(content):
+    """Page title and party rows (name, short name, cell texts) via BeautifulSoup"""
+    soup = BeautifulSoup(content, 'html.parser')
+    title_element = soup.find('title')
+    title_text = title_element.text if title_element else ''
+    results_table = soup.find(id=lambda x: x and x.startswith('stimmentabelle'))
+    if not results_table:
+        return title_text, None
+    tbody_elements = results_table.find_all('tbody')
+    if len(tbody_elements) < 2:
+        return title_text, []
+    rows = []
+    for row in tbody_elements[1].find_all('tr'):
+        cells = [cell.text.strip() for cell in row.find_all(['th', 'td'])]
+        if len(cells) < 6:
+            continue
+        # Use the title of the abbr tag as full party name if available
+        abbr_tag = row.find('abbr')
+        party_name = abbr_tag['title'] if abbr_tag and 'title' in abbr_tag.attrs else cells[0]
+        rows.append((party_name, cells[0], cells))
+    return title_text, rows
+
+ROW_READERS = {'lxml': read_rows_lxml, 'bs4': read_rows_bs4}
+
+def extract_party_data(html_path, parser='lxml'):
     """Extract party election data from an HTML file"""
     with open(html_path, 'r', encoding='utf-8', errors='ignore') as file:
         content = file.read()
     
-    soup = BeautifulSoup(content, 'html.parser')
+    title_text, rows = ROW_READERS[parser](content)
     
-    # Get the Bundesland name from the title
-    title_element = soup.find('title')
+    # Get the Bundesland name from the title ("Ergebnisse Baden-Württemberg - Die Bundeswahlleiterin")
     bundesland = "Unknown"
-    if title_element:
-        title_text = title_element.text
-        if "Ergebnisse" in title_text:
-            parts = title_text.split("Ergebnisse")[1].strip().split("-")[0].strip()
-            bundesland = parts.replace("WÃ¼rttemberg", "Württemberg").replace("ThÃ¼ringen", "Thüringen")
+    if "Ergebnisse" in title_text:
+        bundesland = repair_encoding(title_text.split("Ergebnisse")[1].split(" - ")[0].strip())
     
-    # Find the results table
-    results_table = soup.find(id=lambda x: x and x.startswith('stimmentabelle'))
-    
-    if not results_table:
+    if rows is None:
         print(f"Could not find results table in {html_path}")
         return None, None
-    
-    # Find all rows in the table body (the second tbody contains the party data)
-    try:
-        tbody_elements = results_table.find_all('tbody')
-        if len(tbody_elements) >= 2:
-            rows = tbody_elements[1].find_all('tr')
-        else:
-            rows = []
-            print(f"Could not find party data rows in {html_path}")
-    except Exception as e:
-        print(f"Error finding party rows: {e}")
-        return None, None
+    if not rows:
+        print(f"Could not find party data rows in {html_path}")
     
     party_data = {}
     debug_parties = []
     
-    # Process each row
-    for row in rows:
-        cells = row.find_all(['th', 'td'])
-        if len(cells) < 6:
-            continue
-        
-        # Extract party name from first cell
-        party_cell = cells[0]
-        party_name = party_cell.text.strip()
-        
-        # Debug - print every party name to find Grüne
-        original_party_name = party_name
-        
-        # Check if the cell has an abbr tag and use its title if available
-        abbr_tag = party_cell.find('abbr')
-        if abbr_tag and 'title' in abbr_tag.attrs:
-            party_name = abbr_tag['title']
-        
+    for party_name, short_name, cells in rows:
         # Store for debugging
-        debug_parties.append(f"{party_name} (original: {original_party_name})")
-        
-        # Special case for Grüne
-        if "GR" in party_name.upper() or "GRÜNE" in party_name or "GRÃNE" in party_name or "BÜNDNIS" in party_name or "BÃNDNIS" in party_name:
-            normalized_party = 'Grüne'
-            # Extract vote data, ensure we handle empty cells
-            erststimmen_total = cells[1].text.strip().replace('.', '') if cells[1].text.strip() != '-' else ''
-            erststimmen_percent = cells[2].text.strip().replace(',', '.') if cells[2].text.strip() != '-' else ''
-            zweitstimmen_total = cells[4].text.strip().replace('.', '') if cells[4].text.strip() != '-' else ''
-            zweitstimmen_percent = cells[5].text.strip().replace(',', '.') if cells[5].text.strip() != '-' else ''
-            
-            # Store the data
-            party_data[normalized_party] = {
-                'Erststimmen_total': erststimmen_total,
-                'Erststimmen_percent': erststimmen_percent,
-                'Zweitstimmen_total': zweitstimmen_total,
-                'Zweitstimmen_percent': zweitstimmen_percent
-            }
-            continue
-        
-        # Normalize the party name for other parties
-        normalized_party = normalize_party_name(party_name)
+        debug_parties.append(f"{repair_encoding(party_name)} (original: {repair_encoding(short_name)})")
         
+        normalized_party = normalize_party_name(party_name, short_name)
         if normalized_party in TARGET_PARTIES:
-            # Extract vote data, ensure we handle empty cells
-            erststimmen_total = cells[1].text.strip().replace('.', '') if cells[1].text.strip() != '-' else ''
-            erststimmen_percent = cells[2].text.strip().replace(',', '.') if cells[2].text.strip() != '-' else ''
-            zweitstimmen_total = cells[4].text.strip().replace('.', '') if cells[4].text.strip() != '-' else ''
-            zweitstimmen_percent = cells[5].text.strip().replace(',', '.') if cells[5].text.strip() != '-' else ''
-            
-            # Store the data
-            party_data[normalized_party] = {
-                'Erststimmen_total': erststimmen_total,
-                'Erststimmen_percent': erststimmen_percent,
-                'Zweitstimmen_total': zweitstimmen_total,
-                'Zweitstimmen_percent': zweitstimmen_percent
-            }
+            party_data[normalized_party] = cell_values(cells)
     
     # Debug output to check which parties were found
     print(f"{bundesland}: Found {len(party_data)} parties: {', '.join(party_data.keys())}")
     
-    # Debug for Grüne issue
     if 'Grüne' not in party_data:
         print(f"Could not find Grüne in {bundesland}. All parties found: {'; '.join(debug_parties)}")
     
     return bundesland, party_data
 
-def process_all_html_files():
+def process_all_html_files(html_dir='bundesland_html', parser='lxml'):
     """Process all HTML files in the bundesland_html directory"""
-    html_dir = 'bundesland_html'
     results = []
+    start = time.perf_counter()
     
     for filename in os.listdir(html_dir):
         if filename.endswith('.html'):
             file_path = os.path.join(html_dir, filename)
             print(f"Processing {filename}...")
-            bundesland, party_data = extract_party_data(file_path)
+            file_start = time.perf_counter()
+            bundesland, party_data = extract_party_data(file_path, parser)
+            print(f"Parsed {filename} in {(time.perf_counter() - file_start) * 1000:.1f} ms")
             
             if bundesland and party_data:
                 # Create a row for this Bundesland
@@ -195,6 +219,7 @@ def process_all_html_files():
                 
                 results.append(row)
     
+    print(f"Parsed {len(results)} pages with {parser} in {time.perf_counter() - start:.2f} s")
     return results
 
 def write_csv(results, output_file='wahlergebnisse.csv'):
@@ -220,9 +245,18 @@ def write_csv(results, output_file='wahlergebnisse.csv'):
     
     print(f"Results written to {output_file}")
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Extract the election results per Bundesland into a CSV file")
+    parser.add_argument("--html-dir", default="bundesland_html", help="Directory with the downloaded result pages")
+    parser.add_argument("--parser", choices=sorted(ROW_READERS), default="lxml",
+                        help="HTML parser: lxml (fast, default) or bs4 (BeautifulSoup html.parser)")
+    return parser.parse_args()
+
 if __name__ == "__main__":
+    args = parse_args()
+    
     # Process all HTML files and get the results
-    results = process_all_html_files()
+    results = process_all_html_files(args.html_dir, args.parser)
     
     # Write results to CSV
     write_csv(results)
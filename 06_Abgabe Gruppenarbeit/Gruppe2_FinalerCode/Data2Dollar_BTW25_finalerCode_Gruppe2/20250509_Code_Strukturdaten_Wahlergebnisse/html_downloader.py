@@ -0,0 +1,159 @@
+import asyncio
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import aiohttp
+
+# Browser-like headers, the Bundeswahlleiterin site answers plain clients as well but this is the safe default
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'de-DE,de;q=0.9,en;q=0.5',
+}
+# File in the output directory that remembers ETag/Last-Modified of every downloaded URL
+MANIFEST_NAME = ".download_manifest.json"
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+def write_atomic(path, content):
+    """Write bytes to a temporary file next to path and move it into place"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_manifest(output_dir):
+    manifest_file = Path(output_dir) / MANIFEST_NAME
+    if manifest_file.exists():
+        with open(manifest_file, encoding="utf-8") as f:
+            return json.load(f)
+    return {}
+
+
+def save_manifest(output_dir, manifest):
+    content = json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True).encode("utf-8")
+    write_atomic(Path(output_dir) / MANIFEST_NAME, content)
+
+
+async def fetch(session, url, headers=None, retries=3, limiter=None):
+    """GET with retries and exponential backoff; returns (status, headers, body)
+
+    limiter (a semaphore) is held only while a request runs, so the session timeout
+    does not count the time spent queueing or in backoff sleeps.
+    """
+    limiter = limiter or asyncio.Semaphore(1)
+    for attempt in range(retries + 1):
+        try:
+            async with limiter, session.get(url, headers=headers) as response:
+                retry = response.status in RETRY_STATUS and attempt < retries
+                if not retry:
+                    body = await response.read() if response.status != 304 else b""
+                    if response.status >= 400:
+                        raise aiohttp.ClientResponseError(
+                            response.request_info, response.history, status=response.status, message=response.reason
+                        )
+                    return response.status, response.headers, body
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+            if attempt == retries:
+                raise
+        await asyncio.sleep(2 ** attempt)
+
+
+async def download_one(session, url, output_file, manifest, retries, limiter=None):
+    output_file = Path(output_file)
+    entry = manifest.get(url, {})
+
+    # Conditional request: only if the file from the last run is still there
+    conditional = {}
+    if output_file.exists() and entry.get("file") == str(output_file):
+        if entry.get("etag"):
+            conditional["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            conditional["If-Modified-Since"] = entry["last_modified"]
+
+    status, headers, body = await fetch(session, url, conditional, retries, limiter)
+    if status == 304:
+        return "unchanged"
+
+    write_atomic(output_file, body)
+    manifest[url] = {
+        "file": str(output_file),
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "size": len(body),
+    }
+    return "downloaded"
+
+
+async def download_all(targets, output_dir, per_host=8, headers=None, retries=3, timeout=30):
+    """Download (url, filename) targets into output_dir with a pooled client.
+
+    At most per_host requests run against the same host at a time. Pages whose ETag or
+    Last-Modified did not change since the last run are answered with 304 and skipped.
+    Returns a dict url -> 'downloaded' | 'unchanged' | 'failed'.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    results = {}
+
+    # The semaphore bounds the requests in flight; the timeout covers a single running request
+    limiter = asyncio.Semaphore(per_host)
+    connector = aiohttp.TCPConnector(limit_per_host=per_host)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     headers=headers or DEFAULT_HEADERS) as session:
+        async def run(url, filename):
+            try:
+                results[url] = await download_one(session, url, output_dir / filename, manifest, retries, limiter)
+                if results[url] == "downloaded":
+                    print(f"Successfully downloaded {url} to {output_dir / filename}")
+            except Exception as e:
+                results[url] = "failed"
+                print(f"Error downloading {url}: {e!r}")
+
+        await asyncio.gather(*(run(url, filename) for url, filename in targets))
+
+    save_manifest(output_dir, manifest)
+    counts = {status: list(results.values()).count(status) for status in ("downloaded", "unchanged", "failed")}
+    print(f"Download completed: {counts['downloaded']} downloaded, {counts['unchanged']} unchanged, "
+          f"{counts['failed']} failed")
+    return results
+
+
+async def fetch_all_text(urls, per_host=8, headers=None, retries=3, timeout=30):
+    """Fetch pages (e.g. index pages for link discovery) concurrently; returns url -> text or None"""
+    texts = {}
+    limiter = asyncio.Semaphore(per_host)
+    connector = aiohttp.TCPConnector(limit_per_host=per_host)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout,
+                                     headers=headers or DEFAULT_HEADERS) as session:
+        async def run(url):
+            try:
+                _, _, body = await fetch(session, url, retries=retries, limiter=limiter)
+                texts[url] = body.decode("utf-8", errors="replace")
+            except Exception as e:
+                texts[url] = None
+                print(f"Error fetching {url}: {e!r}")
+
+        await asyncio.gather(*(run(url) for url in urls))
+    return texts
+
+
+def fetch_texts(urls, **kwargs):
+    return asyncio.run(fetch_all_text(urls, **kwargs))
+
+
+def download(targets, output_dir, **kwargs):
+    """Synchronous entry point for the download scripts"""
+    return asyncio.run(download_all(targets, output_dir, **kwargs))
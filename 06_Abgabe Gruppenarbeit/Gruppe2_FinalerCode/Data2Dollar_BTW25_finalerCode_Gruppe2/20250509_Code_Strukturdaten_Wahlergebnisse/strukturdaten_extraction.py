@@ -0,0 +1,159 @@
+import csv
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from lxml import etree, html
+
+# Indicator lookup shared by the Bundesland and the Wahlkreis pages:
+# (figure caption, row header) -> canonical column name, both normalized with normalize_label().
+# Dates and years are stripped, so the same entries match the tables of other election years;
+# further label variants can simply be added as extra keys for the same column name.
+INDICATORS = {
+    ('geografie', 'anzahl gemeinden am'): 'Anzahl Gemeinden',
+    ('geografie', 'fläche in km² am'): 'Fläche km2',
+    ('bevölkerung und alter', 'insgesamt (in 1.000)'): 'Bevölkerung in Tsd',
+    ('bevölkerung und alter', 'davon deutsche (in 1.000)'): 'davon Deutsche in Tsd',
+    ('bevölkerung und alter', 'davon ausländerinnen und ausländer'): 'Ausländer*innenanteil',
+    ('bevölkerung und alter', 'einwohnerinnen und einwohner je km²'): 'Bevölkerungsdichte je km2',
+    ('bevölkerung und alter', 'geburtensaldo'): 'Geburtensaldo',
+    ('bevölkerung und alter', 'wanderungssaldo'): 'Wanderungssaldo',
+    ('bevölkerung und alter', 'unter 18'): 'Alter unter 18',
+    ('bevölkerung und alter', '18 - 24'): 'Alter 18-24',
+    ('bevölkerung und alter', '25 - 34'): 'Alter 25-34',
+    ('bevölkerung und alter', '35 - 59'): 'Alter 35-59',
+    ('bevölkerung und alter', '60 - 74'): 'Alter 60-74',
+    ('bevölkerung und alter', '75 und mehr'): 'Alter über 75',
+    ('flächenerhebung nach art der tatsächlichen nutzung', 'siedlung und verkehr'): 'Bodenfläche Siedlung und Verkehr',
+    ('flächenerhebung nach art der tatsächlichen nutzung', 'vegetation und gewässer'): 'Bodenfläche Vegetation & Gewässer',
+    ('bautätigkeit und wohnungswesen', 'fertiggestellte wohnungen (je 1.000 einwohnerinnen und einwohner)'): 'Fertiggestellte Wohnungen 2021 je Tsd Einwohner*innen',
+    ('bautätigkeit und wohnungswesen', 'bestand an wohnungen am (je 1.000 einwohnerinnen und einwohner)'): 'Bestand an Wohnungen 2021 je Tsd Einwohner*innen',
+    ('bautätigkeit und wohnungswesen', 'wohnfläche am (je wohnung)'): 'Wohnfläche je Wohnnung 2021',
+    ('bautätigkeit und wohnungswesen', 'wohnfläche am (je 1.000 einwohnerinnen und einwohner)'): 'Wohnfläche 2021 je Tsd Einwohner*innen',
+    ('pkw-bestand', 'pkw insgesamt'): 'PKW insgesamt je Tsd Einwohner*innen',
+    ('pkw-bestand', 'pkw mit elektro- oder hybrid-antrieb'): 'PKW Elektro oder Hybrid',
+    ('unternehmensregister', 'unternehmen insgesamt (je 1.000 einwohnerinnen und einwohner)'): 'Unternehmen 2021 je Tsd Einwohner*innen',
+    ('unternehmensregister', 'handwerksunternehmen (je 1.000 einwohnerinnen und einwohner)'): 'Handwerksunternehmen 2021 je Tsd Einwohner*innen',
+    ('berufliches schulwesen', 'schulabgängerinnen und -abgänger beruflicher schulen (je 1.000 einwohnerinnen und einwohner)'): 'Schulabgänger*innen beruflicher Schulen 2022 je Tsd Einwohner*innen',
+    ('allgemeinbildendes schulwesen', 'insgesamt ohne externe (je 1.000 einwohnerinnen und einwohner)'): 'Schulabgänger*innen insgesamt ohne Externe je Tsd Einwohner*innen',
+    ('allgemeinbildendes schulwesen', 'ohne hauptschulabschluss'): 'Schulabgänger*innen ohne Hauptschulabschluss',
+    ('allgemeinbildendes schulwesen', 'mit hauptschulabschluss'): 'Schulabgänger*innen mit Hauptschulabschluss',
+    ('allgemeinbildendes schulwesen', 'mit realschulabschluss'): 'Schulabgänger*innen mit Realschulabschluss',
+    ('allgemeinbildendes schulwesen', 'mit allgemeiner und fachhochschulreife'): 'Schulabgänger*innen mit allgemeiner und Fachhochschulreife',
+    ('öffentlich geförderte kindertagespflege', 'unter 3 jahre'): 'Quote betreute Kinder unter 3 Jahre',
+    ('öffentlich geförderte kindertagespflege', '3 bis unter 6 jahre'): 'Quote betreute Kinder 3-5 Jahre',
+    ('volkswirtschaftliche gesamtrechnungen', 'verfügbares einkommen der privaten haushalte (eur je einwohnerin und einwohner)'): 'Verfügbares Einkommen der privaten Haushalte 2021 EUR je Einwohner*in',
+    ('volkswirtschaftliche gesamtrechnungen', 'bruttoinlandsprodukt (eur je einwohnerin und einwohner)'): 'BIP je Einwohner*in 2021',
+    ('sozialversicherungspflichtig beschäftigte', 'insgesamt (je 1.000 einwohnerinnen und einwohner)'): 'Sozialversicherungspflichtig je Tsd Einwohner*innen',
+    ('sozialversicherungspflichtig beschäftigte', 'land- und forstwirtschaft, fischerei'): 'Anteil Sozialversicherungspflichtiger in Land-, Forstwirtschaft & Fisherei',
+    ('sozialversicherungspflichtig beschäftigte', 'produzierendes gewerbe'): 'Anteil Sozialversicherungspflichtiger im produzierenden Gewerbe',
+    ('sozialversicherungspflichtig beschäftigte', 'handel, gastgewerbe, verkehr'): 'Anteil Sozialversicherungspflichtiger im Handel, Gastgewerbe, Verkehr',
+    ('sozialversicherungspflichtig beschäftigte', 'öffentliche und private dienstleister'): 'Anteil Sozialversicherungspflichtige öffentliche und private Dienstleister',
+    ('sozialversicherungspflichtig beschäftigte', 'übrige dienstleister und „ohne angabe“'): 'Anteil Sozialversicherungspflichtige übrige Dienstleister',
+    ('empfängerinnen und empfänger von leistungen nach sgb ii', 'insgesamt (je 1.000 einwohnerinnen und einwohner)'): 'Empfänger*innen Leistungen SGB II je Tsd Einwohner*innen',
+    ('empfängerinnen und empfänger von leistungen nach sgb ii', 'darunter nicht erwerbsfähige hilfebedürftige'): 'Anteil SGB II Empfänger*innen nichterwerbsfähige Hilfebedürftige',
+    ('empfängerinnen und empfänger von leistungen nach sgb ii', 'darunter ausländerinnen und ausländer'): 'Anteil SGB II Empfänger*innen Ausländer*innen',
+    ('arbeitslosenquote', 'insgesamt'): 'Arbeitslosenquote insgesamt',
+    ('arbeitslosenquote', 'darunter männer'): 'Arbeitslosenquote Männer',
+    ('arbeitslosenquote', 'darunter frauen'): 'Arbeitslosenquote Frauen',
+    ('arbeitslosenquote', 'darunter im alter 15 bis 24 jahre'): 'Arbeitslosenquote 15-24',
+    ('arbeitslosenquote', 'darunter im alter 55 bis 64 jahre'): 'Arbeitslosenquote 55-64',
+}
+# CSV columns in lookup order
+FIELDS = list(dict.fromkeys(INDICATORS.values()))
+
+# Selections compiled once per process; the info links ("i") are not part of a label
+FIGURE_TABLES = etree.XPath("//main//figure/table")
+LABEL_TEXT = etree.XPath("text() | *[not(contains(@class, 'link-info'))]//text()")
+DATE_PATTERN = re.compile(r"\d{1,2}\.\d{1,2}\.\d{4}|\b(?:19|20)\d{2}\b")
+
+
+def normalize_label(element):
+    """Caption/row header text without info links, leading '...', dates and years; casefolded"""
+    text = " ".join("".join(LABEL_TEXT(element)).replace("…", "...").split()).lstrip(". ")
+    return " ".join(DATE_PATTERN.sub("", text).split()).casefold()
+
+
+def extract_numeric_value(text):
+    """Extract numeric value from text, handling different formats including negative values."""
+    if text is None:
+        return None
+    
+    # Remove spaces and replace comma with dot for decimal values
+    text = text.strip()
+    
+    # Check if the value is negative (contains a minus sign)
+    is_negative = '-' in text
+    
+    # Extract numbers with possible comma as decimal separator
+    match = re.search(r'([\d.,]+)', text)
+    if match:
+        value = match.group(1).replace('.', '').replace(',', '.')
+        try:
+            numeric_value = float(value)
+            # Apply negative sign if found in the original text
+            if is_negative:
+                numeric_value = -numeric_value
+            return numeric_value
+        except ValueError:
+            return text
+    return text
+
+
+def parse_tables(tree):
+    """Read every figure table once and map its rows to the canonical indicators"""
+    record = dict.fromkeys(FIELDS)
+    for table in FIGURE_TABLES(tree):
+        caption = table.find("caption")
+        caption_key = normalize_label(caption) if caption is not None else ""
+        for row in table.iter("tr"):
+            header, value = row.find("th"), row.find("td")
+            # Rows without a value cell are group headers ("Bevölkerung am ...")
+            if header is None or value is None:
+                continue
+            field = INDICATORS.get((caption_key, normalize_label(header)))
+            if field is not None:
+                record[field] = extract_numeric_value(value.text_content().strip())
+    return record
+
+
+def parse_file(html_file):
+    """Extract all indicators from one HTML file; returns (record, seconds)"""
+    start = time.perf_counter()
+    with open(html_file, 'r', encoding='utf-8') as f:
+        tree = html.fromstring(f.read())
+    record = parse_tables(tree)
+    return record, time.perf_counter() - start
+
+
+def scrape_files(jobs, csv_file, key_fields, workers=None):
+    """Parse (html_file, key_record) jobs in a process pool and stream the rows to csv_file.
+
+    Rows are written in job order as soon as they (and all earlier jobs) are done.
+    Returns the number of rows written.
+    """
+    if not jobs:
+        print("No data was found to write to the CSV file.")
+        return 0
+    
+    fieldnames = list(key_fields) + FIELDS
+    timings = []
+    start = time.perf_counter()
+    workers = workers or os.cpu_count()
+    with open(csv_file, 'w', newline='', encoding='utf-8') as f, ProcessPoolExecutor(max_workers=workers) as executor:
+        writer = csv.DictWriter(f, fieldnames=fieldnames)
+        writer.writeheader()
+        
+        chunksize = max(1, len(jobs) // (workers * 4))
+        results = executor.map(parse_file, [html_file for html_file, _ in jobs], chunksize=chunksize)
+        for (html_file, key_record), (record, seconds) in zip(jobs, results):
+            writer.writerow({**key_record, **record})
+            timings.append(seconds)
+            print(f"Scraped data for {html_file.stem} ({seconds * 1000:.1f} ms)")
+    
+    total = time.perf_counter() - start
+    print(f"Data has been written to {csv_file}: {len(jobs)} files in {total:.2f} s "
+          f"with {workers} processes (avg {sum(timings) / len(timings) * 1000:.1f} ms, "
+          f"max {max(timings) * 1000:.1f} ms per file)")
+    return len(jobs)